@@ -49,3 +49,4 @@ remove_dir "/usr/share/phantom-player"
 remove_dir "/usr/share/doc/phantom-player"
 remove_file "/usr/share/applications/com.senties-martinelli.PhantomPlayer.desktop"
 remove_file "/usr/bin/phantom-player"
+remove_file "/usr/bin/phantom-player-cli"
@@ -48,6 +48,7 @@ if 'linux' in sys.platform or 'bsd' in sys.platform:
 
     _APP_DIR = system_utils.join_path(_HOME_DIR, ".local/share/phantom-player")
     _SERIES_DIR = _APP_DIR
+    _SNAPSHOTS_DIR = system_utils.join_path(_APP_DIR, ".snapshots")
     _NEW_PLAYLIST_IMG_PATH = system_utils.join_path(_SERIES_DIR, ".png")
     _CONF_FILE = system_utils.join_path(_HOME_DIR, ".config/phantom-player.ini")
 
@@ -55,6 +56,7 @@ elif sys.platform == 'win32':
     _HOME_DIR = system_utils.join_path(r"C:\Users", getpass.getuser())
     _APP_DIR = system_utils.join_path(_HOME_DIR, r"AppData\Local\PhantomPlayer")
     _SERIES_DIR = system_utils.join_path(_APP_DIR, "Playlists")
+    _SNAPSHOTS_DIR = system_utils.join_path(_APP_DIR, "Snapshots")
     _NEW_PLAYLIST_IMG_PATH = system_utils.join_path(_SERIES_DIR, ".png")
     _CONF_FILE = system_utils.join_path(_APP_DIR, "phantom-player.ini")
 
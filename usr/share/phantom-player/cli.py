@@ -0,0 +1,254 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+
+"""
+    Command line tools to work with the playlists, without the graphical interface.
+
+    The playlists should not be modified while Phantom Player is running,
+    otherwise it may overwrite the changes when it saves them.
+"""
+
+import os
+import sys
+import shlex
+import argparse
+
+from Paths import _SERIES_DIR
+from controller import playlist_factory
+from controller import playlist_jsonl
+from controller import smart_playlist_factory
+from model.Library import Library
+from model.Playlist import LoadStatus, _SAVE_EXTENSION
+from model.SmartPlaylist import SmartPlaylist
+from model.VideoQuery import parse_query
+import system_utils
+
+
+def __get_playlist_path(playlist_name: str) -> str:
+    return system_utils.join_path(_SERIES_DIR, playlist_name + _SAVE_EXTENSION)
+
+
+def __export(playlist_name: str, file_path: str) -> int:
+
+    playlist_path = __get_playlist_path(playlist_name)
+    if not os.path.exists(playlist_path):
+        print(f"Error: the playlist '{playlist_name}' does not exist.")
+        return 1
+
+    playlist = playlist_factory.load(playlist_path)
+    videos_nb = playlist_jsonl.export(playlist, file_path)
+    print(f"Exported {videos_nb} videos to {file_path}")
+
+    return 0
+
+
+def __import(file_path: str, playlist_name: str) -> int:
+
+    if not os.path.exists(file_path):
+        print(f"Error: the file '{file_path}' does not exist.")
+        return 1
+
+    if playlist_name == "":
+        playlist_name = playlist_jsonl.read_name(file_path)
+
+        if playlist_name == "":
+            print("Error: the export has no valid playlist name, it must be given.")
+            return 1
+
+    if os.path.exists(__get_playlist_path(playlist_name)):
+        playlist = playlist_factory.load(__get_playlist_path(playlist_name))
+        stats = playlist_jsonl.merge(playlist, file_path)
+    else:
+        playlist, stats = playlist_jsonl.load(file_path, playlist_name)
+
+    playlist.set_load_status(LoadStatus._loaded)
+    playlist_factory.save(playlist)
+
+    added, updated, rejected = stats
+    print(f"Imported into '{playlist.get_name()}': {added} added, {updated} updated, {rejected} rejected videos")
+
+    return 0
+
+
+def __load_library() -> Library:
+
+    file_paths = []
+    if os.path.exists(_SERIES_DIR):
+        file_paths = [system_utils.join_path(_SERIES_DIR, file_name)
+                      for file_name in sorted(os.listdir(_SERIES_DIR))
+                      if file_name.lower().endswith(_SAVE_EXTENSION)]
+
+    library = Library()
+    for _, playlist in playlist_factory.load_all(file_paths):
+        library.add_playlist(playlist)
+
+    return library
+
+
+def __join_terms(terms: list[str]) -> str:
+    """Return the text of a query, where each argument remains a single term."""
+    return " ".join(shlex.quote(term) if any(char.isspace() for char in term) else term for term in terms)
+
+
+def __query(terms: list[str]) -> int:
+
+    try:
+        query = parse_query(__join_terms(terms))
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    results = __load_library().query(query)
+    for playlist, video in results:
+        print(f"{playlist.get_name()}\t{video.get_path()}")
+
+    print(f"{len(results)} videos", file=sys.stderr)
+
+    return 0
+
+
+def __duplicates() -> int:
+
+    groups_nb = 0
+    wasted_size = 0
+
+    for group in __load_library().iter_duplicates():
+        groups_nb += 1
+        wasted_size += group.get_wasted_size()
+
+        print(f"{group.get_hash()}\t{group.get_wasted_size()} bytes wasted")
+        for playlist, video in group.get_videos():
+            print(f"\t{playlist.get_name()}\t{video.get_path()}")
+
+    print(f"{groups_nb} duplicated videos, {wasted_size / 1024 ** 2:.1f} MiB wasted", file=sys.stderr)
+
+    return 0
+
+
+def __smart(action: str, name: str, terms: list[str]) -> int:
+
+    if action == "list":
+        for smart_playlist in smart_playlist_factory.load_all(Library()):
+            print(f"{smart_playlist.get_name()}\t{smart_playlist.get_query_text()}")
+        return 0
+
+    smart_playlist = SmartPlaylist(Library())
+    smart_playlist.set_name(name)
+    save_path = smart_playlist.get_save_path()
+
+    if name == "":
+        print("Error: the name of the smart playlist must be given.")
+        return 1
+
+    elif action == "save":
+        try:
+            smart_playlist.set_query_text(__join_terms(terms))
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+
+        smart_playlist_factory.save(smart_playlist)
+        print(f"Saved '{name}': {smart_playlist.get_query_text()}")
+        return 0
+
+    elif not os.path.exists(save_path):
+        print(f"Error: the smart playlist '{name}' does not exist.")
+        return 1
+
+    elif action == "remove":
+        os.remove(save_path)
+        return 0
+
+    smart_playlist = smart_playlist_factory.load(save_path, __load_library())
+    videos = smart_playlist.get_videos()
+    for video in videos:
+        print(f"{smart_playlist.get_video_playlist(video).get_name()}\t{video.get_path()}")
+
+    print(f"{len(videos)} videos", file=sys.stderr)
+
+    return 0
+
+
+def main(args: list[str]) -> int:
+
+    parser = argparse.ArgumentParser(prog="phantom-player-cli",
+                                     description="Phantom Player command line tools.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export a playlist to a JSON Lines file.")
+    export_parser.add_argument("playlist", help="Name of the playlist.")
+    export_parser.add_argument("file", help="Path of the JSON Lines file.")
+
+    import_parser = subparsers.add_parser("import",
+                                          help="Import a JSON Lines file. If the playlist exists, the videos are merged.")
+    import_parser.add_argument("file", help="Path of the JSON Lines file.")
+    import_parser.add_argument("playlist", nargs="?", default="",
+                               help="Name of the playlist, by default the name of the exported playlist.")
+
+    query_parser = subparsers.add_parser("query",
+                                         help="Print the videos of all the playlists that match a query.",
+                                         description="Terms: rating>=4 duration<20m size>1G progress=0 "
+                                                     "ext:mkv,mp4 is:new|missing|ignored not:new|missing|ignored "
+                                                     "is:unwatched|started|ended path:DIR sort:[-]KEY limit:N, "
+                                                     "and words of the video names. The terms are combined with \"and\".")
+    query_parser.add_argument("terms", nargs="+", help="Terms of the query.")
+
+    subparsers.add_parser("duplicates",
+                          help="Print the videos with the same hash in multiple playlists or with different paths, "
+                               "and the space used by the copies.")
+
+    smart_parser = subparsers.add_parser("smart",
+                                         help="Save, list, show or remove the smart playlists, "
+                                              "which contain the videos that match a query.")
+    smart_parser.add_argument("action", choices=("save", "list", "show", "remove"))
+    smart_parser.add_argument("name", nargs="?", default="", help="Name of the smart playlist.")
+    smart_parser.add_argument("terms", nargs="*", help="Terms of the query to save, see the query command.")
+
+    parsed_args = parser.parse_args(args)
+
+    match parsed_args.command:
+        case "export":
+            return __export(parsed_args.playlist, parsed_args.file)
+
+        case "import":
+            return __import(parsed_args.file, parsed_args.playlist)
+
+        case "query":
+            return __query(parsed_args.terms)
+
+        case "duplicates":
+            return __duplicates()
+
+        case "smart":
+            return __smart(parsed_args.action, parsed_args.name, parsed_args.terms)
+
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,141 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+import os
+from queue import Queue, Empty
+from threading import Thread, Lock
+from typing import Callable
+
+from model.Playlist import Playlist
+from model.Video import Video
+from vlc_utils import get_video_duration
+from console_printer import print_debug
+
+_BATCH_TIMEOUT = 2  # Seconds without new videos before calling the done_func of the modified playlists
+
+
+class MetadataBackfill:
+    """
+        Fill the unknown duration & size of the videos in a background thread.
+
+        The playlists are loaded without probing the videos (a VLC parse takes
+        at least 100 ms per file), so the missing metadata is filled here:
+            + The updated videos are notified by their playlist, as model events.
+            + done_func(playlist) is called once per modified playlist, when the
+              queue is empty. It is used to save the playlist in one batch.
+
+        The files are probed in the thread, but the playlists are not thread-safe, so the
+        values are set by idle_func(func, *args), which runs func in the thread that owns
+        the playlists (GLib.idle_add in the GUI). Without it, they are set by the thread.
+    """
+
+    def __init__(self,
+                 done_func: Callable[[Playlist], None] | None=None,
+                 idle_func: Callable[..., object] | None=None) -> None:
+
+        self.__done_func = done_func
+        self.__idle_func = idle_func
+
+        self.__queue = Queue()
+        self.__queued_keys = set()
+        self.__lock = Lock()
+        self.__quit = False
+
+        self.__thread = Thread(target=self.__on_thread_backfill, daemon=True)
+        self.__thread.start()
+
+    def add_playlist(self, playlist: Playlist) -> None:
+        """Queue the videos of the playlist with an unknown duration or size."""
+
+        with self.__lock:
+            for video in playlist.get_videos().snapshot():  # It can be called from a thread
+                if video.get_duration() > 0 and video.get_size() > 0:
+                    continue
+
+                key = (playlist.get_guid(), video.get_hash())
+                if key in self.__queued_keys:
+                    continue
+
+                self.__queued_keys.add(key)
+                self.__queue.put((playlist, video))
+
+    def quit(self) -> None:
+        """Stop the thread, the videos that were not probed will be probed on the next start."""
+        self.__quit = True
+        self.__queue.put(None)
+        self.__thread.join()
+
+    def __on_thread_backfill(self) -> None:
+
+        modified_playlists = {}
+
+        while not self.__quit:
+
+            try:
+                item = self.__queue.get(timeout=_BATCH_TIMEOUT)
+            except Empty:
+                for playlist in modified_playlists.values():
+                    if self.__done_func is not None:
+                        self.__done_func(playlist)
+
+                modified_playlists.clear()
+                continue
+
+            if item is None:
+                break
+
+            playlist, video = item
+
+            with self.__lock:
+                self.__queued_keys.discard((playlist.get_guid(), video.get_hash()))
+
+            path = video.get_path()
+            if not os.path.exists(path):
+                continue  # It will remain unknown
+
+            print_debug(f"path={path}")
+
+            duration = get_video_duration(path) if video.get_duration() <= 0 else None
+            size = os.path.getsize(path) if video.get_size() <= 0 else None
+
+            if self.__idle_func is None:
+                self.__set_metadata(video, duration, size)
+            else:
+                self.__idle_func(self.__set_metadata, video, duration, size)
+
+            modified_playlists[playlist.get_guid()] = playlist
+
+    @staticmethod
+    def __set_metadata(video: Video, duration: int | None, size: int | None) -> bool:
+
+        if duration is not None and video.get_duration() <= 0:
+            video.set_duration(duration)
+
+        if size is not None and video.get_size() <= 0:
+            video.set_size(size)
+
+        return False  # Do not call it again (GLib.idle_add)
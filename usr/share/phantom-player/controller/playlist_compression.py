@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+
+"""
+    Compressed storage of the playlist files.
+
+    The compressed files contain the same text as the plain ones, framed by
+    zlib (gzip) or zstd. When reading, the format is detected from the first
+    bytes of the file, so any playlist can be loaded whatever the setting.
+
+    zstd needs the zstandard module, if it is not installed zlib is used.
+"""
+
+import io
+import gzip
+from typing import TextIO
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from console_printer import print_warning
+
+
+class Compression:
+    _none = None
+    _zlib = "zlib"
+    _zstd = "zstd"
+
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_ZLIB_LEVEL = 6
+_ZSTD_LEVEL = 10
+
+
+def get_compression(file_path: str) -> str | None:
+    """Detect the compression of a file from its first bytes."""
+
+    with open(file_path, mode='rb') as f:
+        magic = f.read(len(_ZSTD_MAGIC))
+
+    if magic.startswith(_GZIP_MAGIC):
+        return Compression._zlib
+
+    elif magic == _ZSTD_MAGIC:
+        return Compression._zstd
+
+    return Compression._none
+
+
+def open_read(file_path: str) -> TextIO:
+    """Open a playlist file in text mode, whether it is compressed or not."""
+
+    match get_compression(file_path):
+        case Compression._zlib:
+            return gzip.open(file_path, mode='rt', encoding='utf-8')
+
+        case Compression._zstd:
+            if zstandard is None:
+                raise OSError(f"The zstandard module is needed to read {file_path}")
+
+            reader = zstandard.ZstdDecompressor().stream_reader(open(file_path, mode='rb'), closefd=True)
+            return io.TextIOWrapper(io.BufferedReader(reader), encoding='utf-8')
+
+        case _:
+            return open(file_path, mode='rt', encoding='utf-8')
+
+
+def open_write(file_path: str, compression: str | None, buffer_size: int) -> TextIO:
+    """Open a playlist file in text mode, to be written with the given compression."""
+
+    if compression == Compression._zstd and zstandard is None:
+        print_warning("The zstandard module is not installed, using zlib.")
+        compression = Compression._zlib
+
+    match compression:
+        case Compression._zlib:
+            writer = gzip.GzipFile(file_path, mode='wb', compresslevel=_ZLIB_LEVEL)
+
+        case Compression._zstd:
+            writer = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).stream_writer(open(file_path, mode='wb'),
+                                                                                closefd=True)
+
+        case _:
+            return open(file_path, mode='w', encoding='utf-8', buffering=buffer_size)
+
+    return io.TextIOWrapper(io.BufferedWriter(writer, buffer_size), encoding='utf-8')
@@ -27,18 +27,25 @@
 
 
 import os
-from typing import Sequence
+import multiprocessing
+from threading import Lock
+from typing import Callable, Iterator, Sequence, TextIO
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 from Paths import _SERIES_DIR
-from settings import _VIDEO_HASH_SIZE
-from model.Playlist import Playlist, LoadStatus
+from settings import _VIDEO_HASH_SIZE, _PLAYLIST_SNAPSHOTS, _LOAD_PLAYLISTS_PROCESSES, _PLAYLIST_COMPRESSION
+from controller import playlist_snapshot
+from controller import playlist_compression
+from controller import playlist_migrations
+from controller.playlist_migrations import _SCHEMA_VERSION, _LEGACY_SCHEMA_VERSION
+from model.Playlist import Playlist, LoadStatus, Summary
 from model.PlaylistPath import PlaylistPath
 from model.Video import Video
-from vlc_utils import get_video_duration
 from console_printer import print_debug, print_error, print_warning
 
 _COLUMN_SEPARATOR = "|"
 _VALUE_SEPARATOR = "="
+_PREFIX_SEPARATOR = ":"
 
 # These must be either GET or SET
 _PLAYLIST_ATTR = ('hidden',
@@ -47,7 +54,8 @@ _PLAYLIST_ATTR = ('hidden',
                   'start_at',
                   'audio_track',
                   'subtitles_track',
-                  'current_video_hash')
+                  'current_video_hash',
+                  'shuffle_mode')
 
 _PLAYLIST_PATH_ATTR = ('recursive', 'startup_discover')
 _VIDEO_ATTR = ('duration', 'progress', 'ignore', 'path', 'name', 'size', 'rating')
@@ -60,340 +68,621 @@ _PLAYLIST_SETTINGS_HEADER = """
 """
 
 
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
+__LOAD_VIDEOS_LOCK = Lock()
+
+# The getters are looked up once, instead of for every value that is saved
+__PLAYLIST_COLUMNS = tuple((attr_name + _VALUE_SEPARATOR, getattr(Playlist, "get_" + attr_name))
+                           for attr_name in _PLAYLIST_ATTR)
+__PLAYLIST_PATH_COLUMNS = tuple((attr_name + _VALUE_SEPARATOR, getattr(PlaylistPath, "get_" + attr_name))
+                                for attr_name in _PLAYLIST_PATH_ATTR)
+__VIDEO_COLUMNS = tuple((attr_name + _VALUE_SEPARATOR, getattr(Video, "get_" + attr_name))
+                        for attr_name in _VIDEO_ATTR)
+__VIDEO_PREFIXES = tuple(attr_prefix for attr_prefix, _ in __VIDEO_COLUMNS)
+__PATH_COLUMN = _COLUMN_SEPARATOR + "path" + _VALUE_SEPARATOR
+
+
 class SaveParams:
     class Section:
+        _schema = "[SCHEMA]"
         _settings = "[SETTINGS]"
         _sources = "[SOURCES]"
+        _summary = "[SUMMARY]"
+        _shuffle = "[SHUFFLE]"
         _videos = "[VIDEOS]"
 
+    class PathColumn:
+        _full = "full"
+        _prefixed = "prefixed"  # Number of characters shared with the previous path, and the rest of the path
+
 
-def load(file_path: str) -> Playlist:
-    """Load a playlist from a file."""
+def load(file_path: str, headers_only: bool=False) -> Playlist:
+    """
+        Load a playlist from a file.
+
+        The file is read in a single pass: each line is routed to the handler
+        of the section that it belongs to, so no line is scanned twice.
+
+        If headers_only is True, the reading stops at the videos section and
+        the videos will be loaded later by load_videos(). Files of an older schema
+        are always loaded completely, migrated and saved.
+    """
     print_debug(f"Path={file_path}")
-    file_lines = __get_lines(file_path)
+
+    if _PLAYLIST_SNAPSHOTS and not headers_only:
+        playlist = playlist_snapshot.load(file_path)
+        if playlist is not None:
+            return playlist
 
     playlist = Playlist()
     playlist.set_name(os.path.basename(file_path))
 
-    __load_settings(playlist, file_lines)
+    videos_loaded, version = __read_file(playlist, file_path, read_headers=True, read_videos=not headers_only)
+    playlist.set_videos_loaded(videos_loaded)
+
+    if version < _SCHEMA_VERSION:
+        playlist_migrations.migrate(playlist, version)
+        __write(playlist)  # It creates the snapshot
 
-    for playlist_path in __load_playlist_paths(file_lines):
-        added = playlist.add_playlist_path(playlist_path)
-        if not added:
-            print_error(f'rejected path={file_path}')
+    else:
+        if version > _SCHEMA_VERSION:
+            print_warning(f"The schema {version} of {file_path} is newer than {_SCHEMA_VERSION}")
 
-    __load_videos(playlist, file_lines)
+        if _PLAYLIST_SNAPSHOTS and videos_loaded:
+            playlist_snapshot.save(playlist, file_path)
 
     return playlist
 
 
+def load_all(file_paths: Sequence[str],
+             headers_only: bool=False,
+             quit_func: Callable[[], bool] | None=None) -> Iterator[tuple[int, Playlist]]:
+    """
+        Load multiple playlist files in parallel, and yield (index, playlist)
+        as soon as each file is loaded. The index is the position of the file
+        in file_paths, so the caller can give a stable order to the playlists.
+
+        Parsing is CPU bound, so the files are loaded by a process pool. When only
+        the headers are read, the work is I/O bound and a thread pool is used.
+    """
+    if len(file_paths) == 0:
+        return
+
+    max_workers = min(len(file_paths), os.cpu_count() or 1)
+
+    if max_workers == 1:
+        for i, file_path in enumerate(file_paths):
+            if quit_func is not None and quit_func():
+                return
+
+            try:
+                playlist = load(file_path, headers_only)
+            except Exception as e:
+                print_error(f"Error loading {file_path}: {e}")
+                continue
+
+            yield i, playlist
+
+        return
+
+    # "forkserver" forks the workers from a clean process, and not from the GUI with its threads.
+    if _LOAD_PLAYLISTS_PROCESSES and not headers_only and "forkserver" in multiprocessing.get_all_start_methods():
+        executor = ProcessPoolExecutor(max_workers=max_workers,
+                                       mp_context=multiprocessing.get_context("forkserver"))
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    with executor:
+        futures = {executor.submit(load, file_path, headers_only): i for i, file_path in enumerate(file_paths)}
+
+        for future in as_completed(futures):
+
+            if quit_func is not None and quit_func():
+                executor.shutdown(wait=False, cancel_futures=True)
+                return
+
+            try:
+                playlist = future.result()
+            except Exception as e:
+                print_error(f"Error loading {file_paths[futures[future]]}: {e}")
+                continue
+
+            yield futures[future], playlist
+
+
+def load_videos(playlist: Playlist) -> None:
+    """Load the videos of a playlist that was loaded with headers_only=True."""
+    with __LOAD_VIDEOS_LOCK:
+        if playlist.get_videos_loaded():
+            return
+
+        print_debug(f"Loading videos... {playlist.get_name()}")
+
+        file_path = playlist.get_save_path()
+
+        if _PLAYLIST_SNAPSHOTS and playlist_snapshot.load_videos(playlist, file_path):
+            playlist.set_videos_loaded(True)
+            return
+
+        __read_file(playlist, file_path, read_headers=False, read_videos=True)
+        playlist.set_videos_loaded(True)
+
+        if _PLAYLIST_SNAPSHOTS:
+            playlist_snapshot.save(playlist, file_path)
+
+
 def save(playlist: Playlist) -> None:
-    """Save a playlist to its local file."""
+    """
+        Save a playlist to its local file.
+
+        The lines are streamed to a buffered file, which replaces the
+        playlist file once it is complete.
+    """
     if playlist.get_load_status() == LoadStatus._waiting_load:
         return
 
+    # Otherwise, the videos not yet loaded would be lost
+    load_videos(playlist)
+
+    __write(playlist)
+
+
+def __write(playlist: Playlist) -> None:
     print_debug(f"Saving... {playlist.get_name()}")
 
     if not os.path.exists(_SERIES_DIR):
         os.mkdir(_SERIES_DIR)
 
-    data = _PLAYLIST_SETTINGS_HEADER
+    save_path = playlist.get_save_path()
+    tmp_path = save_path + ".tmp"
+    videos = playlist.get_videos().snapshot()  # It can be saved from a thread
 
-    #
-    # Add the playlist data
-    #
-    data += "\n\n{}\n\n".format(SaveParams.Section._settings)
-    for attr_name in _PLAYLIST_ATTR:
-        value = getattr(playlist, "get_" + attr_name)()
-        data += f"{attr_name}={value}\n"
+    # The paths are only prefixed in the compressed files, so the plain files remain easy to edit
+    if _PLAYLIST_COMPRESSION is None:
+        video_columns = __VIDEO_COLUMNS
+    else:
+        video_columns = __get_prefixed_video_columns()
 
-    #
-    # Add the source's data
-    #
-    data += f"\n\n{SaveParams.Section._sources}\n\n"
-    for playlist_path in playlist.get_playlist_paths():
-        data += __join_obj_attributes(playlist_path.get_path(), playlist_path, _PLAYLIST_PATH_ATTR)
+    with playlist_compression.open_write(tmp_path, _PLAYLIST_COMPRESSION, _WRITE_BUFFER_SIZE) as f:
+        f.write(_PLAYLIST_SETTINGS_HEADER)
 
-    #
-    # Add the video's data
-    #
-    data += f"\n\n{SaveParams.Section._videos}\n\n"
-    for video in playlist.get_videos():
-        data += __join_obj_attributes(video.get_hash(), video, _VIDEO_ATTR)
+        f.write(f"\n\n{SaveParams.Section._schema}\n\n")
+        f.write(f"version={_SCHEMA_VERSION}\n")
+        if _PLAYLIST_COMPRESSION is not None:
+            f.write(f"paths={SaveParams.PathColumn._prefixed}\n")
 
-    # Write the file
-    with open(playlist.get_save_path(), mode='w', encoding='utf-8') as f:
-        f.write(data)
+        #
+        # Add the playlist data
+        #
+        f.write(f"\n\n{SaveParams.Section._settings}\n\n")
+        for attr_prefix, get_value in __PLAYLIST_COLUMNS:
+            f.write(f"{attr_prefix}{get_value(playlist)}\n")
 
+        #
+        # Add the source's data
+        #
+        f.write(f"\n\n{SaveParams.Section._sources}\n\n")
+        for playlist_path in playlist.get_playlist_paths():
+            __write_obj_columns(f, playlist_path.get_path(), playlist_path, __PLAYLIST_PATH_COLUMNS)
 
-def __load_value_boolean(value: str, default: bool, param_name: str) -> bool:
+        #
+        # Add the summary, so the playlist can be displayed without loading the videos
+        #
+        f.write(f"\n\n{SaveParams.Section._summary}\n\n")
+        for key, value in playlist.get_summary().items():
+            f.write(f"{key}{_VALUE_SEPARATOR}{value}\n")
 
-    match value.lower().strip():
-        case 'true':
-            return True
-        case 'false':
-            return False
-        case _:
-            print_warning(f"\tError getting {param_name}")
-            return default
+        #
+        # Add the hashes of the videos already played by the shuffle, so they are not repeated after a restart
+        #
+        f.write(f"\n\n{SaveParams.Section._shuffle}\n\n")
+        for video_hash in playlist.get_shuffle().get_played_hashes():
+            f.write(f"{video_hash}\n")
 
+        #
+        # Add the video's data
+        #
+        f.write(f"\n\n{SaveParams.Section._videos}\n\n")
+        for video in videos:
+            __write_obj_columns(f, video.get_hash(), video, video_columns)
 
-def __load_value_int(value: str, default: int, param_name: str) -> int:
-    try:
-        return int(value)
+    os.replace(tmp_path, save_path)
 
-    except ValueError:
-        print_warning(f"\tError getting {param_name}")
+    # The file changed, so the snapshot is refreshed from the playlist in memory instead of parsing it on the next start
+    if _PLAYLIST_SNAPSHOTS and playlist.get_videos_loaded():
+        playlist_snapshot.save(playlist, save_path, videos)
 
-    return default
 
+def __get_prefixed_video_columns() -> tuple[tuple[str, Callable], ...]:
+    """Return the video columns, with the paths written relative to the previous video."""
 
-def __load_settings(playlist: Playlist, file_lines: Sequence[str]) -> None:
-    hidden = False
-    random = False
-    keep_playing = False
-    start_at = 0
-    audio_track = 0
-    subtitles_track = 0
-    current_video_hash = ""
+    previous_path = ""
 
-    for line in __get_section_content(file_lines, SaveParams.Section._settings):
+    def get_prefixed_path(video: Video) -> str:
+        nonlocal previous_path
 
-        if _VALUE_SEPARATOR not in line:
-            print_error(f"Error parsing header, line={line}")
-            continue
+        path = video.get_path()
+        prefix_size = len(os.path.commonprefix((previous_path, path)))
+        previous_path = path
 
-        param_name = line.split(_VALUE_SEPARATOR)[0].strip()
-        value = line.split(_VALUE_SEPARATOR)[1].strip()
+        return f"{prefix_size}{_PREFIX_SEPARATOR}{path[prefix_size:]}"
 
-        match param_name:
+    return tuple((attr_prefix, get_prefixed_path if attr_name == "path" else get_value)
+                 for attr_name, (attr_prefix, get_value) in zip(_VIDEO_ATTR, __VIDEO_COLUMNS))
 
-            case "hidden":
-                hidden = __load_value_boolean(value, hidden, param_name)
 
-            case "random":
-                random = __load_value_boolean(value, random, param_name)
+def __read_file(playlist: Playlist, file_path: str, read_headers: bool, read_videos: bool) -> tuple[bool, int]:
+    """Return if the videos were loaded, and the schema version of the file."""
 
-            case "keep_playing":
-                keep_playing = __load_value_boolean(value, keep_playing, param_name)
+    imported_paths = set()
+    version = _LEGACY_SCHEMA_VERSION
+    prefixed_paths = False
+    previous_path = ""
+    load_line = None
 
-            case 'start_at':
-                start_at = __load_value_int(value, start_at, param_name)
+    with playlist_compression.open_read(file_path) as f:
+        for line_nb, line in enumerate(f, 1):
+            line = line.strip()
 
-            case 'audio_track':
-                audio_track = __load_value_int(value, audio_track, param_name)
+            if line == "" or line.startswith("#"):
+                continue
 
-            case 'subtitles_track':
-                subtitles_track = __load_value_int(value, subtitles_track, param_name)
+            elif line.startswith("["):
+                match line:
+                    case SaveParams.Section._schema:
+                        load_line = __load_schema_line
+                    case SaveParams.Section._settings:
+                        load_line = __load_settings_line if read_headers else __skip_line
+                    case SaveParams.Section._sources:
+                        load_line = __load_playlist_path_line if read_headers else __skip_line
+                    case SaveParams.Section._summary:
+                        load_line = __load_summary_line if read_headers else __skip_line
+                    case SaveParams.Section._shuffle:
+                        load_line = __load_shuffle_line if read_headers else __skip_line
+                    case SaveParams.Section._videos:
+                        if version == _SCHEMA_VERSION:
+                            if not read_videos:
+                                # The headers are always written before the videos
+                                return False, version
+                            load_line = __load_video_line
+                        else:
+                            load_line = __load_legacy_video_line
+                    case _:
+                        load_line = None
+                        print_warning(f"Unknown section, line {line_nb}: {line}")
 
-            case 'current_video_hash':
-                current_video_hash = value
+                continue
 
-            case _:
-                print_error(f"Error: wrong attr name on line={line}")
+            elif load_line is None:
+                print_warning(f"Line outside of a section, line {line_nb}: {line}")
+                continue
 
-    #
-    # Create the playlist (without loading the videos)
-    #
-    playlist.set_hidden(hidden)
-    playlist.set_random(random)
-    playlist.set_keep_playing(keep_playing)
-    playlist.set_audio_track(audio_track)
-    playlist.set_subtitles_track(subtitles_track)
-    playlist.set_start_at(start_at)
-    playlist.set_current_video_hash(current_video_hash)
+            elif load_line is __load_schema_line:
+                version, prefixed_paths = __load_schema_line(line, line_nb, version, prefixed_paths)
+                continue
 
+            elif prefixed_paths and (load_line is __load_video_line or load_line is __load_legacy_video_line):
+                line, previous_path = __expand_path(line, line_nb, previous_path)
 
-def __load_playlist_paths(file_lines: Sequence[str]) -> list[PlaylistPath]:
-    playlist_paths = []
+            load_line(playlist, line, line_nb, imported_paths)
 
-    for line in __get_section_content(file_lines, SaveParams.Section._sources):
+    return True, version
 
-        recursive = False
-        r_startup = False
 
-        #
-        # Read the data
-        #
-        columns = line.split(_COLUMN_SEPARATOR)
+def __load_schema_line(line: str, line_nb: int, version: int, prefixed_paths: bool) -> tuple[int, bool]:
+    """Return the version of the schema, and if the video paths are prefixed."""
 
-        data_path = columns[0].strip()
-        if "/" not in data_path and "\\" not in data_path:
-            print("\tError: invalid path", line)
-            continue
-        columns.pop(0)
+    param_name, _, value = line.partition(_VALUE_SEPARATOR)
+    param_name = param_name.strip()
+    value = value.strip()
 
-        # Read the rest of the columns
-        for column in columns:
-            if _VALUE_SEPARATOR not in column:
-                print("\tWarning: Path with invalid column.", line)
+    match param_name:
 
-            param_name = column.split(_VALUE_SEPARATOR)[0].strip()
-            value = column.split(_VALUE_SEPARATOR)[1].strip()
+        case "version":
+            version = __load_value_int(value, version, param_name, line_nb)
 
-            match param_name:
-                case "recursive":
-                    recursive = __load_value_boolean(value, recursive, param_name)
+        case "paths":
+            match value:
+                case SaveParams.PathColumn._prefixed:
+                    prefixed_paths = True
+                case SaveParams.PathColumn._full:
+                    prefixed_paths = False
+                case _:
+                    print_warning(f"\tError getting {param_name}, line {line_nb}")
 
-                case "startup_discover":
-                    r_startup = __load_value_boolean(value, r_startup, param_name)
+        case _:
+            print_warning(f"Warning: ignored schema parameter, line {line_nb}: {line}")
 
-                case _:
-                    print("\tWarning: Path with ignored parameter", line)
+    return version, prefixed_paths
 
-        playlist_path = PlaylistPath(path=data_path,
-                                     recursive=recursive,
-                                     startup_discover=r_startup)
 
-        playlist_paths.append(playlist_path)
+def __expand_path(line: str, line_nb: int, previous_path: str) -> tuple[str, str]:
+    """Return the line with the full path of the video, and the path."""
 
-    return playlist_paths
+    start = line.find(__PATH_COLUMN)
+    if start == -1:
+        return line, previous_path
 
+    start += len(__PATH_COLUMN)
+    end = line.find(_COLUMN_SEPARATOR, start)
+    if end == -1:
+        end = len(line)
 
-def __load_videos(playlist: Playlist, file_lines: Sequence[str]) -> None:
-    imported_hash_paths = {}
+    prefix_size, _, suffix = line[start:end].partition(_PREFIX_SEPARATOR)
 
-    for line in __get_section_content(file_lines, SaveParams.Section._videos):
+    try:
+        prefix_size = int(prefix_size)
+    except ValueError:
+        print_warning(f"\tError getting the path prefix, line {line_nb}")
+        return line, previous_path
 
-        path = ""
-        name = ""
-        progress = 0
-        duration = 0
-        rating = 0
-        size = 0
-        ignore = False
+    path = previous_path[:prefix_size] + suffix
 
-        #
-        # Read the data
-        #
-        columns = line.split(_COLUMN_SEPARATOR)
+    return line[:start] + path + line[end:], path
+
+
+def __skip_line(_playlist: Playlist, _line: str, _line_nb: int, _imported_paths: set[str]) -> None:
+    pass
+
+
+def __load_value_boolean(value: str, default: bool, param_name: str, line_nb: int) -> bool:
 
-        # Since hashes are the ID of videos, if there's no hash, the
-        # video shall be rejected.
-        hash_file = columns[0].strip()
-        if len(hash_file) < _VIDEO_HASH_SIZE:
-            print("\tError: Video with invalid hash.", line)
+    match value.lower():
+        case 'true':
+            return True
+        case 'false':
+            return False
+        case _:
+            print_warning(f"\tError getting {param_name}, line {line_nb}")
+            return default
+
+
+def __load_value_int(value: str, default: int, param_name: str, line_nb: int) -> int:
+    try:
+        return int(value)
+
+    except ValueError:
+        print_warning(f"\tError getting {param_name}, line {line_nb}")
+
+    return default
+
+
+def __load_columns(columns: Sequence[str], line_nb: int) -> dict[str, str]:
+    """Split the `name=value` columns of a line, each one only once."""
+    values = {}
+
+    for column in columns:
+        param_name, separator, value = column.partition(_VALUE_SEPARATOR)
+        if separator == "":
+            print_warning(f"\tInvalid column, line {line_nb}: {column}")
             continue
 
-        columns.pop(0)
+        values[param_name.strip()] = value.strip()
 
-        # Read the rest of the columns
-        for column in columns:
-            if _VALUE_SEPARATOR not in column:
-                print("\tWarning: Video with invalid column.", line)
+    return values
 
-            param_name = column.split(_VALUE_SEPARATOR)[0].strip()
-            value = column.split(_VALUE_SEPARATOR)[1].strip()
 
-            match param_name:
-                case "path":
-                    if "/" in value or "\\" in value:
-                        path = value
-                    else:
-                        print("\tError: Video with invalid path.", line)
-                        continue
+def __load_settings_line(playlist: Playlist, line: str, line_nb: int, _imported_paths: set[str]) -> None:
 
-                case "name":
-                    name = value
+    param_name, separator, value = line.partition(_VALUE_SEPARATOR)
+    if separator == "":
+        print_error(f"Error parsing header, line {line_nb}: {line}")
+        return
 
-                case "progress":
-                    progress = __load_value_int(value, progress, param_name)
+    param_name = param_name.strip()
+    value = value.strip()
 
-                case "duration":
-                    duration = __load_value_int(value, duration, param_name)
+    match param_name:
 
-                case "size":
-                    size = __load_value_int(value, size, param_name)
+        case "hidden":
+            playlist.set_hidden(__load_value_boolean(value, playlist.get_hidden(), param_name, line_nb))
 
-                case 'rating':
-                    rating = __load_value_int(value, rating, param_name)
+        case "random":
+            playlist.set_random(__load_value_boolean(value, playlist.get_random(), param_name, line_nb))
 
-                case "ignore":
-                    ignore = __load_value_boolean(value, ignore, param_name)
+        case "keep_playing":
+            playlist.set_keep_playing(__load_value_boolean(value, playlist.get_keep_playing(), param_name, line_nb))
 
-                case _:
-                    print("\tWarning: Video with ignored parameter", line)
+        case 'start_at':
+            playlist.set_start_at(__load_value_int(value, playlist.get_start_at(), param_name, line_nb))
 
-        #
-        # Check for valid lines
-        #
-        if path == "":
-            print("\tError: Video without path.", line)
-            continue
+        case 'audio_track':
+            playlist.set_audio_track(__load_value_int(value, playlist.get_audio_track(), param_name, line_nb))
 
-        # This test was removed to improve the time when starting the software.
-        # Normally, this filter was already applied when importing the videos
-        # for the first time.
-        #
-        # elif os.path.exists(path) and not __file_is_video(path, True):
-        #    print("\t\tSkipping line because not video.", columns)
-        #    continue
+        case 'subtitles_track':
+            playlist.set_subtitles_track(__load_value_int(value, playlist.get_subtitles_track(), param_name, line_nb))
 
-        elif path in imported_hash_paths.values():
-            print("\tError: Video already path added", line)
-            continue
+        case 'current_video_hash':
+            playlist.set_current_video_hash(value)
 
-        elif hash_file in imported_hash_paths.keys():
-            print("\tError: Video hash already imported", hash_file)
-            print("\t\tImported path:", imported_hash_paths[hash_file])
-            print("\t\tSkipped path:", path)
-            continue
+        case 'shuffle_mode':
+            playlist.set_shuffle_mode(value)
 
-        if os.path.exists(path):
-            # This is only to have backwards compatibility with the new columns
-            # while developing the software.
+        case _:
+            print_error(f"Error: wrong attr name, line {line_nb}: {line}")
 
-            if duration <= 0:
-                duration = get_video_duration(path)
 
-            if size <= 0:
-                size = os.path.getsize(path)
+def __load_summary_line(playlist: Playlist, line: str, line_nb: int, _imported_paths: set[str]) -> None:
 
-        video = Video(vhash=hash_file, path=path, name=name)
-        video.set_duration(duration)
-        video.set_progress(progress)
-        video.set_ignore(ignore)
-        video.set_rating(rating)
-        video.set_size(size)
-        playlist.add_video(video)
-        imported_hash_paths[hash_file] = path
+    param_name, separator, value = line.partition(_VALUE_SEPARATOR)
+    if separator == "":
+        print_error(f"Error parsing summary, line {line_nb}: {line}")
+        return
+
+    param_name = param_name.strip()
+
+    if param_name in Summary._all:
+        playlist.set_cached_summary_value(param_name, __load_value_int(value.strip(), 0, param_name, line_nb))
+    else:
+        print_warning(f"Warning: ignored summary parameter, line {line_nb}: {line}")
+
+
+def __load_shuffle_line(playlist: Playlist, line: str, line_nb: int, _imported_paths: set[str]) -> None:
+
+    if _COLUMN_SEPARATOR in line or _VALUE_SEPARATOR in line:
+        print_warning(f"Warning: ignored shuffle hash, line {line_nb}: {line}")
+        return
+
+    playlist.get_shuffle().add_played_hash(line)
+
+
+def __load_playlist_path_line(playlist: Playlist, line: str, line_nb: int, _imported_paths: set[str]) -> None:
+
+    columns = line.split(_COLUMN_SEPARATOR)
+
+    data_path = columns[0].strip()
+    if "/" not in data_path and "\\" not in data_path:
+        print_warning(f"\tError: invalid path, line {line_nb}: {line}")
+        return
+
+    values = __load_columns(columns[1:], line_nb)
+    recursive = __load_value_boolean(values.pop("recursive", "false"), False, "recursive", line_nb)
+    r_startup = __load_value_boolean(values.pop("startup_discover", "false"), False, "startup_discover", line_nb)
+
+    for param_name in values:
+        print_warning(f"\tWarning: Path with ignored parameter {param_name}, line {line_nb}")
+
+    playlist_path = PlaylistPath(path=data_path,
+                                 recursive=recursive,
+                                 startup_discover=r_startup)
+
+    if not playlist.add_playlist_path(playlist_path):
+        print_error(f'rejected path={data_path}, line {line_nb}')
 
 
-def __join_obj_attributes(obj_id: str, obj: object, attr_list: Sequence[str]) -> str:
-    line_data = obj_id
-    for attr_name in attr_list:
-        value = getattr(obj, "get_" + attr_name)()
-        line_data += _COLUMN_SEPARATOR + f"{attr_name}={value}"
+def __load_video_line(playlist: Playlist, line: str, line_nb: int, imported_paths: set[str]) -> None:
+    """
+        Current schema: all the columns are written, in the order of _VIDEO_ATTR.
+        Lines that do not follow it are loaded by __load_legacy_video_line.
+    """
 
-    return line_data + "\n"
+    columns = line.split(_COLUMN_SEPARATOR)
 
+    if len(columns) != len(__VIDEO_PREFIXES) + 1 or not all(map(str.startswith, columns[1:], __VIDEO_PREFIXES)):
+        __load_legacy_video_line(playlist, line, line_nb, imported_paths)
+        return
 
-def __get_section_content(file_lines: Sequence[str], section_name: str) -> list[str]:
-    content = []
+    # Same order as _VIDEO_ATTR
+    duration, progress, ignore, path, name, size, rating = [column[len(attr_prefix):] for column, attr_prefix in
+                                                            zip(columns[1:], __VIDEO_PREFIXES)]
+    try:
+        duration = int(duration)
+        progress = int(progress)
+        size = int(size)
+        rating = int(rating)
+    except ValueError:
+        __load_legacy_video_line(playlist, line, line_nb, imported_paths)
+        return
 
-    section_found = False
-    for line in file_lines:
-        if line == section_name:
-            section_found = True
+    if ignore not in ("True", "False"):
+        __load_legacy_video_line(playlist, line, line_nb, imported_paths)
+        return
 
-        elif section_found:
-            if line.startswith("["):
-                break
+    __add_video(playlist, line, line_nb, imported_paths,
+                hash_file=columns[0],
+                path=path,
+                name=name,
+                duration=duration,
+                progress=progress,
+                size=size,
+                rating=rating,
+                ignore=ignore == "True")
+
+
+def __load_legacy_video_line(playlist: Playlist, line: str, line_nb: int, imported_paths: set[str]) -> None:
+    """Load a line with missing columns, or columns in any order."""
+
+    columns = line.split(_COLUMN_SEPARATOR)
+
+    hash_file = columns[0].strip()
+    values = __load_columns(columns[1:], line_nb)
+
+    path = values.pop("path", "")
+    name = values.pop("name", "")
+    progress = __load_value_int(values.pop("progress", "0"), 0, "progress", line_nb)
+    duration = __load_value_int(values.pop("duration", "0"), 0, "duration", line_nb)
+    size = __load_value_int(values.pop("size", "0"), 0, "size", line_nb)
+    rating = __load_value_int(values.pop("rating", "0"), 0, "rating", line_nb)
+    ignore = __load_value_boolean(values.pop("ignore", "false"), False, "ignore", line_nb)
+
+    for param_name in values:
+        print_warning(f"\tWarning: Video with ignored parameter {param_name}, line {line_nb}")
+
+    __add_video(playlist, line, line_nb, imported_paths,
+                hash_file=hash_file,
+                path=path,
+                name=name,
+                duration=duration,
+                progress=progress,
+                size=size,
+                rating=rating,
+                ignore=ignore)
+
+
+def __add_video(playlist: Playlist,
+                line: str,
+                line_nb: int,
+                imported_paths: set[str],
+                hash_file: str,
+                path: str,
+                name: str,
+                duration: int,
+                progress: int,
+                size: int,
+                rating: int,
+                ignore: bool) -> None:
 
-            content.append(line)
+    #
+    # Check for valid lines
+    #
 
-    return content
+    # Since hashes are the ID of videos, if there's no hash, the
+    # video shall be rejected.
+    if len(hash_file) < _VIDEO_HASH_SIZE:
+        print_warning(f"\tError: Video with invalid hash, line {line_nb}: {line}")
+        return
 
+    elif path == "":
+        print_warning(f"\tError: Video without path, line {line_nb}: {line}")
+        return
+
+    elif "/" not in path and "\\" not in path:
+        print_warning(f"\tError: Video with invalid path, line {line_nb}: {line}")
+        return
+
+    # This test was removed to improve the time when starting the software.
+    # Normally, this filter was already applied when importing the videos
+    # for the first time.
+    #
+    # elif os.path.exists(path) and not __file_is_video(path, True):
+    #    print("\t\tSkipping line because not video.", columns)
+    #    return
+
+    elif path in imported_paths:
+        print_warning(f"\tError: Video already path added, line {line_nb}: {path}")
+        return
+
+    imported_video = playlist.get_video_by_hash(hash_file)
+    if imported_video is not None:
+        print_warning(f"\tError: Video hash already imported, line {line_nb}: {hash_file}"
+                      f"\n\t\tImported path: {imported_video.get_path()}"
+                      f"\n\t\tSkipped path: {path}")
+        return
 
-def __get_lines(file_path: str) -> list[str]:
-    with open(file_path, mode='rt', encoding='utf-8') as f:
-        lines = f.readlines()
+    # A duration or size <= 0 is unknown, it is not probed here because it would block
+    # the loading. The MetadataBackfill will fill it in the background.
 
-    clean_lines = []
-    for line in lines:
-        line = line.strip()
+    video = Video(vhash=hash_file, path=path, name=name)
+    video.set_duration(duration)
+    video.set_progress(progress)
+    video.set_ignore(ignore)
+    video.set_rating(rating)
+    video.set_size(size)
+    playlist.add_video(video)
+    imported_paths.add(path)
 
-        if not line.startswith("#") and line != "":
-            clean_lines.append(line)
 
-    return clean_lines
+def __write_obj_columns(f: TextIO, obj_id: str, obj: object, columns: Sequence[tuple[str, Callable]]) -> None:
+    f.write(_COLUMN_SEPARATOR.join([obj_id] + [f"{attr_prefix}{get_value(obj)}" for attr_prefix, get_value in columns]))
+    f.write("\n")
@@ -0,0 +1,323 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+
+"""
+    Export & import of the playlists in the JSON Lines format.
+
+    The first record of a file is the header of the playlist (its settings and
+    sources), and it is followed by one record per video. The files are read
+    and written one record at a time, so the memory used does not depend on the
+    size of the file.
+
+    The videos are merged by hash, and their metadata is taken from the records,
+    so the imported files are neither hashed nor probed.
+"""
+
+import os
+import json
+from typing import TextIO
+
+from settings import _VIDEO_HASH_SIZE
+from controller import playlist_factory
+from controller.playlist_factory import _PLAYLIST_ATTR, _PLAYLIST_PATH_ATTR, _WRITE_BUFFER_SIZE
+from model.Playlist import Playlist
+from model.PlaylistPath import PlaylistPath
+from model.Video import Video
+from console_printer import print_debug, print_warning
+
+_JSONL_FORMAT = "phantom-player"
+_JSONL_VERSION = 1
+
+
+class RecordType:
+    _playlist = "playlist"
+    _video = "video"
+
+
+class MergeResult:
+    _added = 0
+    _updated = 1
+    _rejected = 2
+
+
+def export(playlist: Playlist, file_path: str) -> int:
+    """Export a playlist to file_path, and return the number of exported videos."""
+
+    print_debug(f"Exporting... {playlist.get_name()} to {file_path}")
+
+    playlist_factory.load_videos(playlist)
+
+    header = {"type": RecordType._playlist,
+              "format": _JSONL_FORMAT,
+              "version": _JSONL_VERSION,
+              "name": playlist.get_name(),
+              "settings": {attr_name: getattr(playlist, "get_" + attr_name)() for attr_name in _PLAYLIST_ATTR},
+              "sources": [{"path": playlist_path.get_path()} |
+                          {attr_name: getattr(playlist_path, "get_" + attr_name)() for attr_name in _PLAYLIST_PATH_ATTR}
+                          for playlist_path in playlist.get_playlist_paths()]}
+
+    videos = playlist.get_videos().snapshot()
+
+    with open(file_path, mode='w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+        __write_record(f, header)
+
+        for video in videos:
+            __write_record(f, {"type": RecordType._video,
+                               "hash": video.get_hash(),
+                               "path": video.get_path(),
+                               "name": video.get_name(),
+                               "duration": video.get_duration(),
+                               "progress": video.get_progress(),
+                               "ignore": video.get_ignore(),
+                               "size": video.get_size(),
+                               "rating": video.get_rating()})
+
+    return len(videos)
+
+
+def read_name(file_path: str) -> str:
+    """Return the name of the exported playlist, without reading the videos."""
+
+    with open(file_path, mode='rt', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line == "":
+                continue
+
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                return ""
+
+            if isinstance(record, dict) and record.get("type") == RecordType._playlist:
+                return __get_name(record)
+
+            return ""
+
+    return ""
+
+
+def load(file_path: str, name: str="") -> tuple[Playlist, tuple[int, int, int]]:
+    """
+        Create a new playlist from an exported file, see merge() for the stats.
+        If no name is given, the name of the exported playlist is used.
+    """
+
+    playlist = Playlist()
+    if name != "":
+        playlist.set_name(name)
+
+    stats = __read(file_path, playlist, read_header=True)
+
+    return playlist, stats
+
+
+def merge(playlist: Playlist, file_path: str) -> tuple[int, int, int]:
+    """
+        Merge an exported file into a playlist, and return the number of
+        added, updated and rejected videos.
+
+        The settings and sources of the playlist are kept, only the videos are merged:
+
+            + New hash: the video is added with the metadata of the record.
+            + Known hash: the progress, rating & ignore state of the record are
+              applied. The duration & size are only filled if they were unknown,
+              and the local path is kept.
+    """
+    playlist_factory.load_videos(playlist)
+
+    return __read(file_path, playlist, read_header=False)
+
+
+def __write_record(f: TextIO, record: dict) -> None:
+    f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+    f.write("\n")
+
+
+def __read(file_path: str, playlist: Playlist, read_header: bool) -> tuple[int, int, int]:
+
+    print_debug(f"Importing... {file_path}")
+
+    stats = [0, 0, 0]  # Indexed by MergeResult
+    imported_paths = {video.get_path() for video in playlist.get_videos().snapshot()}
+    header_read = False
+
+    with open(file_path, mode='rt', encoding='utf-8') as f:
+        for line_nb, line in enumerate(f, 1):
+            line = line.strip()
+            if line == "":
+                continue
+
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                print_warning(f"\tError: invalid record, line {line_nb}: {e}")
+                stats[MergeResult._rejected] += 1
+                continue
+
+            if not isinstance(record, dict):
+                print_warning(f"\tError: invalid record, line {line_nb}")
+                stats[MergeResult._rejected] += 1
+                continue
+
+            match record.get("type"):
+
+                case RecordType._video:
+                    stats[__merge_video(playlist, record, line_nb, imported_paths)] += 1
+
+                case RecordType._playlist:
+                    if header_read:
+                        print_warning(f"\tError: header already read, line {line_nb}")
+
+                    elif record.get("format") != _JSONL_FORMAT:
+                        raise ValueError(f"{file_path} is not a {_JSONL_FORMAT} export")
+
+                    elif not isinstance(record.get("version"), int) or record["version"] > _JSONL_VERSION:
+                        print_warning(f"The version {record.get('version')} of {file_path} is not supported")
+
+                    if read_header and not header_read:
+                        __load_header(playlist, record, line_nb)
+
+                    header_read = True
+
+                case _:
+                    print_warning(f"\tWarning: ignored record, line {line_nb}")
+
+    if not header_read:
+        print_warning(f"{file_path} has no header")
+
+    return stats[MergeResult._added], stats[MergeResult._updated], stats[MergeResult._rejected]
+
+
+def __load_header(playlist: Playlist, record: dict, line_nb: int) -> None:
+
+    if playlist.get_name() == "":
+        name = __get_name(record)
+        if name == "":
+            print_warning(f"\tError getting name, line {line_nb}")
+        else:
+            playlist.set_name(name)
+
+    settings = record.get("settings", {})
+    for attr_name in _PLAYLIST_ATTR:
+        if attr_name not in settings:
+            continue
+
+        value = settings[attr_name]
+        # The current value gives the type of the attribute
+        if type(value) is not type(getattr(playlist, "get_" + attr_name)()):
+            print_warning(f"\tError getting {attr_name}, line {line_nb}")
+            continue
+
+        getattr(playlist, "set_" + attr_name)(value)
+
+    for source in record.get("sources", []):
+        path = source.get("path", "")
+        if not isinstance(path, str) or path == "":
+            print_warning(f"\tError: source without path, line {line_nb}")
+            continue
+
+        playlist_path = PlaylistPath(path=path,
+                                     recursive=source.get("recursive", False) is True,
+                                     startup_discover=source.get("startup_discover", False) is True)
+
+        if not playlist.add_playlist_path(playlist_path):
+            print_warning(f"\tError: rejected path={path}, line {line_nb}")
+
+
+def __get_name(record: dict) -> str:
+    name = record.get("name", "")
+
+    # The name is a file name, it can not be a path
+    if not isinstance(name, str) or os.path.basename(name) != name:
+        return ""
+
+    return name
+
+
+def __get_int(record: dict, key: str) -> int:
+    value = record.get(key, 0)
+    if type(value) is not int:
+        raise ValueError(key)
+
+    return value
+
+
+def __merge_video(playlist: Playlist, record: dict, line_nb: int, imported_paths: set[str]) -> int:
+
+    video_hash = record.get("hash", "")
+    path = record.get("path", "")
+    name = record.get("name", "")
+
+    if not isinstance(video_hash, str) or len(video_hash) < _VIDEO_HASH_SIZE:
+        print_warning(f"\tError: Video with invalid hash, line {line_nb}")
+        return MergeResult._rejected
+
+    elif not isinstance(path, str) or path == "":
+        print_warning(f"\tError: Video without path, line {line_nb}")
+        return MergeResult._rejected
+
+    try:
+        duration = __get_int(record, "duration")
+        progress = __get_int(record, "progress")
+        size = __get_int(record, "size")
+        rating = __get_int(record, "rating")
+    except ValueError as e:
+        print_warning(f"\tError getting {e}, line {line_nb}")
+        return MergeResult._rejected
+
+    ignore = record.get("ignore", False) is True
+
+    video = playlist.get_video_by_hash(video_hash)
+
+    if video is not None:
+        if video.get_duration() <= 0:
+            video.set_duration(duration)
+        if video.get_size() <= 0:
+            video.set_size(size)
+
+        video.set_progress(progress)
+        video.set_rating(rating)
+        video.set_ignore(ignore)
+        return MergeResult._updated
+
+    elif path in imported_paths:
+        print_warning(f"\tError: Video path already added with another hash, line {line_nb}: {path}")
+        return MergeResult._rejected
+
+    video = Video(vhash=video_hash, path=path, name=name if isinstance(name, str) else "")
+    video.set_duration(duration)
+    video.set_progress(progress)
+    video.set_ignore(ignore)
+    video.set_rating(rating)
+    video.set_size(size)
+    video.set_is_new(True)
+    playlist.add_video(video)
+    imported_paths.add(path)
+
+    return MergeResult._added
@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+"""
+    Migrations of the playlist files.
+
+    The playlist files store the version of their schema. When an older file
+    is loaded, the migration steps from its version to _SCHEMA_VERSION are
+    applied to the loaded playlist, and then the playlist is saved, so each
+    step is applied only once.
+
+    To add a new schema version:
+        + Increase _SCHEMA_VERSION.
+        + Add to __MIGRATIONS the step from the previous version.
+"""
+
+from model.Playlist import Playlist
+from console_printer import print_info
+
+_SCHEMA_VERSION = 1
+_LEGACY_SCHEMA_VERSION = 0  # Files saved before the schema was versioned
+
+
+def __migrate_legacy(playlist: Playlist) -> None:
+    """
+        Version 0 -> 1:
+            + The rows could miss columns or have them in any order, they are now
+              always written in the order of _VIDEO_ATTR.
+            + The unknown durations & sizes are left to the MetadataBackfill.
+            + Some progresses were saved greater than the duration.
+    """
+    for video in playlist.get_videos().snapshot():
+        if 0 < video.get_duration() < video.get_progress():
+            video.end_progress()
+
+
+# Step to go from version N (key) to N+1
+__MIGRATIONS = {
+    0: __migrate_legacy,
+}
+
+
+def migrate(playlist: Playlist, version: int) -> None:
+    """Apply the migration steps to a playlist loaded from a file of an older version."""
+
+    while version < _SCHEMA_VERSION:
+        print_info(f"Migrating {playlist.get_name()} from schema {version} to {version + 1}")
+        __MIGRATIONS[version](playlist)
+        version += 1
@@ -0,0 +1,212 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+"""
+    Binary snapshots of the playlists, to avoid parsing the playlist files
+    at every start.
+
+    A snapshot stores the fingerprint (size, modification time and hash) of
+    the playlist file that it was created from. If the playlist file changes,
+    the snapshot is ignored and it will be created again after parsing the file.
+"""
+
+import os
+import pickle
+import hashlib
+
+from Paths import _SNAPSHOTS_DIR
+from model.Playlist import Playlist
+from model.PlaylistPath import PlaylistPath
+from model.Video import Video
+from model.VideoTable import VideoTable
+from console_printer import print_debug, print_warning
+import system_utils
+
+_SNAPSHOT_VERSION = 3
+_SNAPSHOT_EXTENSION = ".snapshot"
+
+
+def load(file_path: str) -> Playlist | None:
+    """Load a playlist from the snapshot of file_path, if it is up to date."""
+
+    data = __read(file_path)
+    if data is None:
+        return None
+
+    settings, playlist_paths, videos = data
+
+    playlist = Playlist()
+    playlist.set_name(os.path.basename(file_path))
+
+    (hidden,
+     random,
+     keep_playing,
+     start_at,
+     audio_track,
+     subtitles_track,
+     current_video_hash,
+     shuffle_mode,
+     shuffle_played_hashes) = settings
+
+    playlist.set_hidden(hidden)
+    playlist.set_random(random)
+    playlist.set_keep_playing(keep_playing)
+    playlist.set_start_at(start_at)
+    playlist.set_audio_track(audio_track)
+    playlist.set_subtitles_track(subtitles_track)
+    playlist.set_current_video_hash(current_video_hash)
+    playlist.set_shuffle_mode(shuffle_mode)
+    for video_hash in shuffle_played_hashes:
+        playlist.get_shuffle().add_played_hash(video_hash)
+
+    for path, recursive, startup_discover in playlist_paths:
+        playlist.add_playlist_path(PlaylistPath(path=path,
+                                                recursive=recursive,
+                                                startup_discover=startup_discover))
+
+    __add_videos(playlist, videos)
+
+    return playlist
+
+
+def load_videos(playlist: Playlist, file_path: str) -> bool:
+    """Add the videos of the snapshot of file_path to a playlist, if the snapshot is up to date."""
+
+    data = __read(file_path)
+    if data is None:
+        return False
+
+    _settings, _playlist_paths, videos = data
+    __add_videos(playlist, videos)
+
+    return True
+
+
+def save(playlist: Playlist, file_path: str, videos: list[Video] | None=None) -> None:
+    """
+        Create the snapshot of a playlist that was just loaded from or saved to file_path.
+        The videos are the ones written to the file, by default the current ones.
+    """
+
+    settings = (playlist.get_hidden(),
+                playlist.get_random(),
+                playlist.get_keep_playing(),
+                playlist.get_start_at(),
+                playlist.get_audio_track(),
+                playlist.get_subtitles_track(),
+                playlist.get_current_video_hash(),
+                playlist.get_shuffle_mode(),
+                tuple(playlist.get_shuffle().get_played_hashes()))
+
+    playlist_paths = [(playlist_path.get_path(),
+                       playlist_path.get_recursive(),
+                       playlist_path.get_startup_discover()) for playlist_path in playlist.get_playlist_paths()]
+
+    if videos is None:
+        videos = playlist.get_videos().snapshot()
+
+    videos = VideoTable(videos)
+
+    snapshot_path = __get_snapshot_path(file_path)
+    tmp_path = snapshot_path + ".tmp"
+
+    try:
+        if not os.path.exists(_SNAPSHOTS_DIR):
+            os.makedirs(_SNAPSHOTS_DIR)
+
+        with open(tmp_path, mode='wb') as f:
+            # The fingerprint is pickled separately, so the data is not read if the snapshot is stale.
+            pickle.dump((_SNAPSHOT_VERSION, __get_fingerprint(file_path)), f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump((settings, playlist_paths, videos), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(tmp_path, snapshot_path)
+
+    except OSError as e:
+        print_warning(f"It was not possible to save the snapshot of {file_path}: {e}")
+
+
+def remove(file_path: str) -> None:
+    snapshot_path = __get_snapshot_path(file_path)
+    if os.path.exists(snapshot_path):
+        os.remove(snapshot_path)
+
+
+def __read(file_path: str) -> tuple | None:
+
+    snapshot_path = __get_snapshot_path(file_path)
+    if not os.path.exists(snapshot_path):
+        return None
+
+    try:
+        with open(snapshot_path, mode='rb') as f:
+            version, fingerprint = pickle.load(f)
+
+            if version != _SNAPSHOT_VERSION or not __is_fingerprint_valid(file_path, fingerprint):
+                print_debug(f"Stale snapshot {snapshot_path}")
+                return None
+
+            return pickle.load(f)
+
+    except Exception as e:
+        # Including the errors of the snapshots pickled before a change of the model classes
+        print_warning(f"Invalid snapshot {snapshot_path}: {e}")
+
+    return None
+
+
+def __add_videos(playlist: Playlist, videos: VideoTable) -> None:
+    for video in videos.get_videos():
+        playlist.add_video(video)
+
+
+def __is_fingerprint_valid(file_path: str, fingerprint: tuple[int, int, str]) -> bool:
+    size, mtime, file_hash = fingerprint
+
+    # Do not hash the file if the stats already changed
+    stat = os.stat(file_path)
+    if stat.st_size != size or stat.st_mtime_ns != mtime:
+        return False
+
+    return __get_file_hash(file_path) == file_hash
+
+
+def __get_fingerprint(file_path: str) -> tuple[int, int, str]:
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns, __get_file_hash(file_path)
+
+
+def __get_file_hash(file_path: str) -> str:
+    with open(file_path, "rb") as f:
+        file_hash = hashlib.sha256()
+        while chunk := f.read(65536):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
+
+
+def __get_snapshot_path(file_path: str) -> str:
+    return system_utils.join_path(_SNAPSHOTS_DIR, os.path.basename(file_path) + _SNAPSHOT_EXTENSION)
@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+"""
+    Save and load the smart playlists. Only the query is saved, the videos
+    are read from the library once it is loaded.
+"""
+
+import os
+
+from Paths import _SERIES_DIR
+from model.Library import Library
+from model.SmartPlaylist import SmartPlaylist, _SAVE_EXTENSION
+from console_printer import print_debug, print_error, print_warning
+import system_utils
+
+_VALUE_SEPARATOR = "="
+
+_SMART_PLAYLIST_SETTINGS_HEADER = """
+#
+# Smart playlist file for Phantom-Player
+# https://phantom-player.rsm92.fr
+#
+"""
+
+
+class SaveParams:
+    class Section:
+        _settings = "[SETTINGS]"
+
+
+def save(smart_playlist: SmartPlaylist) -> None:
+    print_debug(f"Saving... {smart_playlist.get_name()}")
+
+    if not os.path.exists(_SERIES_DIR):
+        os.mkdir(_SERIES_DIR)
+
+    save_path = smart_playlist.get_save_path()
+    tmp_path = save_path + ".tmp"
+
+    with open(tmp_path, mode='wt', encoding='utf-8') as f:
+        f.write(_SMART_PLAYLIST_SETTINGS_HEADER)
+
+        f.write(f"\n\n{SaveParams.Section._settings}\n\n")
+        f.write(f"query={smart_playlist.get_query_text()}\n")
+
+    os.replace(tmp_path, save_path)
+
+
+def load(file_path: str, library: Library) -> SmartPlaylist:
+    print_debug(f"Path={file_path}")
+
+    smart_playlist = SmartPlaylist(library)
+    smart_playlist.set_name(os.path.basename(file_path))
+
+    section = None
+    with open(file_path, mode='rt', encoding='utf-8') as f:
+        for line_nb, line in enumerate(f, start=1):
+            line = line.strip()
+
+            if line == "" or line.startswith("#"):
+                continue
+
+            elif line == SaveParams.Section._settings:
+                section = line
+
+            elif section == SaveParams.Section._settings:
+                __load_settings_line(smart_playlist, line, line_nb)
+
+            else:
+                print_warning(f"Warning: ignored line {line_nb}: {line}")
+
+    return smart_playlist
+
+
+def load_all(library: Library) -> list[SmartPlaylist]:
+    """Load the smart playlists of the series directory, sorted by name."""
+
+    if not os.path.exists(_SERIES_DIR):
+        return []
+
+    smart_playlists = []
+    for file_name in sorted(os.listdir(_SERIES_DIR)):
+        if file_name.lower().endswith(_SAVE_EXTENSION):
+            smart_playlists.append(load(system_utils.join_path(_SERIES_DIR, file_name), library))
+
+    return smart_playlists
+
+
+def __load_settings_line(smart_playlist: SmartPlaylist, line: str, line_nb: int) -> None:
+
+    param_name, separator, value = line.partition(_VALUE_SEPARATOR)
+    if separator == "":
+        print_error(f"Error parsing header, line {line_nb}: {line}")
+        return
+
+    param_name = param_name.strip()
+    value = value.strip()
+
+    match param_name:
+
+        case "query":
+            try:
+                smart_playlist.set_query_text(value)
+            except ValueError as e:
+                print_error(f"Error: invalid query, line {line_nb}: {e}")
+
+        case _:
+            print_error(f"Error: wrong attr name, line {line_nb}: {line}")
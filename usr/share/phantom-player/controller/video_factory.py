@@ -31,6 +31,7 @@ import inspect
 import hashlib
 
 import system_utils
+import file_availability
 from model.Video import Video
 from vlc_utils import get_video_duration
 from controller.playlist_factory import _COLUMN_SEPARATOR
@@ -59,10 +60,16 @@ else: # python-magic-bin
     def get_mime(path:str) -> str:
         return magic.from_file(path, mime=True)
 
-def discover(playlist, playlist_paths=None, add_func=None, update_func=None, quit_func=None):
+def discover(playlist, playlist_paths=None, add_func=None, update_func=None, quit_func=None, library=None):
+    """
+        Add the new videos of the playlist paths. If a library is given, the durations
+        of the files that it already indexes (in any playlist) are not read again.
+    """
     print_debug(f"playlist name={playlist.get_name()}")
 
-    current_data = {video.get_hash(): video.get_path() for video in playlist.get_videos()}
+    # It runs in a thread, the GUI may move or remove videos meanwhile
+    current_data = {video.get_hash(): video.get_path() for video in playlist.get_videos().snapshot()}
+    current_paths = set(current_data.values())  # Updated with the added videos
 
     if playlist_paths is None:
         playlist_paths = playlist.get_playlist_paths()
@@ -70,11 +77,12 @@ def discover(playlist, playlist_paths=None, add_func=None, update_func=None, qui
     for playlist_path in playlist_paths:
         __discover_playlist_path(playlist=playlist,
                                  playlist_path=playlist_path,
-                                 exclude_data=list(current_data.values()),
+                                 exclude_data=current_paths,
                                  current_data=current_data,
                                  add_func=add_func,
                                  update_func=update_func,
-                                 quit_func=quit_func)
+                                 quit_func=quit_func,
+                                 library=library)
 
 
 def __discover_playlist_path(playlist,
@@ -83,7 +91,8 @@ def __discover_playlist_path(playlist,
                              current_data,
                              add_func=None,
                              update_func=None,
-                             quit_func=None):
+                             quit_func=None,
+                             library=None):
 
     source_path = playlist_path.get_path()
     print_debug(f"path={source_path}")
@@ -107,7 +116,8 @@ def __discover_playlist_path(playlist,
                                  exclude_paths=exclude_data,
                                  current_data=current_data,
                                  add_func=add_func,
-                                 update_func=update_func)
+                                 update_func=update_func,
+                                 library=library)
 
                 if quit_func is not None and quit_func():
                     return
@@ -121,7 +131,8 @@ def __discover_playlist_path(playlist,
                                  exclude_paths=exclude_data,
                                  current_data=current_data,
                                  add_func=add_func,
-                                 update_func=update_func)
+                                 update_func=update_func,
+                                 library=library)
 
             if quit_func is not None and quit_func():
                 return
@@ -132,10 +143,11 @@ def __discover_video(playlist,
                      exclude_paths,
                      current_data,
                      add_func=None,
-                     update_func=None):
+                     update_func=None,
+                     library=None):
 
     if file_path in exclude_paths:
-        return
+        return  # No message on already added videos
 
     elif file_path.endswith(".part"):
         return
@@ -147,12 +159,13 @@ def __discover_video(playlist,
     elif not __file_is_video(file_path):
         return
 
-    elif file_path in current_data.values():
-        return  # No message on already added videos
-
     print_debug(f"playlist name={playlist.get_name()}, file_path={file_path}")
 
+    file_size = os.path.getsize(file_path)
+
+    # The file is always hashed: a file replaced by another one of the same size keeps its path
     video_hash = __file_hash(file_path)
+
     if video_hash in current_data.keys():
 
         imported_path = current_data[video_hash]
@@ -169,6 +182,7 @@ def __discover_video(playlist,
             video.set_path(file_path)
             video.set_is_new(True)
             current_data[video_hash] = file_path
+            exclude_paths.add(file_path)
 
             print_debug("\t\tUpdating path of video:", direct_output=True)
             print_debug(f"\t\t\tOld path: {imported_path}", direct_output=True)
@@ -185,18 +199,32 @@ def __discover_video(playlist,
     # It is important to not save the playlist here when a video is added. Because
     # it will make it appear as "new" until the playlist is opened by the user.
     #
+    file_availability.invalidate(file_path)  # The directory may be cached without the new file
+
     new_video = Video(vhash=video_hash, path=file_path)
-    new_video.set_duration(get_video_duration(file_path))
-    new_video.set_size(os.path.getsize(file_path))
+    new_video.set_duration(__get_duration(file_path, video_hash, library))
+    new_video.set_size(file_size)
     new_video.set_is_new(True)
 
     playlist.add_video(new_video)
     current_data[video_hash] = file_path
+    exclude_paths.add(file_path)
     print_debug(f"\t\tAdding...{file_path}", direct_output=True)
     if add_func is not None:
         add_func(playlist, new_video)
 
 
+def __get_duration(file_path, video_hash, library=None):
+    """Return the duration of a video, from a copy already known by the library if possible."""
+
+    if library is not None:
+        for _, video in library.get_videos_by_hash(video_hash):
+            if video.get_duration() > 0:
+                return video.get_duration()
+
+    return get_video_duration(file_path)
+
+
 def __file_is_video(path:str) -> bool:
 
     if os.path.islink(path) or path.endswith(".lnk"):
@@ -0,0 +1,219 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+
+"""
+    Cached availability of the files.
+
+    Checking if a file exists is a system call per file, which can take a long
+    time on network shares. Instead, the content of each directory is listed
+    once and cached for settings._FILE_AVAILABILITY_SECONDS, or until it is
+    invalidated.
+
+    On Linux, the mount points are read from /proc/self/mountinfo. When a mount
+    point that was mounted disappears (a USB drive, a network share, etc), all
+    the directories inside it are unavailable without any system call.
+
+    The functions connected with connect() are called with a directory when the
+    availability of its files (and of its sub-directories) may have changed.
+    They can be called from any thread.
+
+    The cache is used from the GTK thread, the discovery and the backfill threads,
+    so it is only read and modified with a lock. The directories are listed and the
+    connected functions are called without it.
+"""
+
+import os
+import re
+import time
+from threading import Lock
+
+import settings
+
+_MOUNTINFO_PATH = "/proc/self/mountinfo"
+
+# normcase(directory): (monotonic time of the listing, set of normcase(file names) or None if not available)
+__DIRECTORIES = {}
+
+# Incremented on each invalidation, so the values computed from the cache know when they are stale
+__GENERATION = 0
+
+__CHANGED_FUNCS = []
+
+__MOUNT_POINTS = frozenset()  # Mounted now
+__UNMOUNTED_POINTS = frozenset()  # Mounted before, but not now
+__MOUNTS_TIME = None  # Monotonic time of the last reading of the mount points
+__MOUNTINFO_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+__LOCK = Lock()
+
+
+def connect(func) -> None:
+    """func(directory) is called when the availability of the files of directory may have changed."""
+    with __LOCK:
+        __CHANGED_FUNCS.append(func)
+
+
+def disconnect(func) -> None:
+    with __LOCK:
+        if func in __CHANGED_FUNCS:
+            __CHANGED_FUNCS.remove(func)
+
+
+def exists(path: str) -> bool:
+    directory, file_name = os.path.split(os.path.normcase(path))
+    file_names = __get_file_names(directory)
+    return file_names is not None and file_name in file_names
+
+
+def exists_directory(path: str) -> bool:
+    return __get_file_names(os.path.normcase(path).rstrip(os.sep) or os.sep) is not None
+
+
+def get_generation() -> int:
+    with __LOCK:
+        return __GENERATION
+
+
+def check_mounts() -> None:
+    """Read the mount points again, to be called periodically."""
+    __update_mount_points(time.monotonic(), force=True)
+
+
+def invalidate(path: str | None=None) -> None:
+    """
+        Invalidate the cache of the directory that contains path (and of path itself if it is
+        a directory), to be called when a file is added, renamed or deleted. If path is None,
+        all the cache is invalidated.
+    """
+    global __GENERATION
+
+    with __LOCK:
+        __GENERATION += 1
+
+        if path is None:
+            __DIRECTORIES.clear()
+            return
+
+        path = os.path.normcase(path)
+        __DIRECTORIES.pop(os.path.dirname(path), None)
+        __DIRECTORIES.pop(path, None)
+
+
+def __get_file_names(directory: str) -> frozenset[str] | None:
+
+    now = time.monotonic()
+    __update_mount_points(now)
+
+    with __LOCK:
+        cached = __DIRECTORIES.get(directory)
+        if cached is not None and now - cached[0] < settings._FILE_AVAILABILITY_SECONDS:
+            return cached[1]
+
+        is_unmounted = __is_unmounted(directory)
+
+    # Without the lock, listing a network share can take a long time
+    file_names = None if is_unmounted else __list_directory(directory)
+
+    with __LOCK:
+        __DIRECTORIES[directory] = (now, file_names)
+
+    if cached is not None and cached[1] != file_names:
+        __notify_changed(directory)
+
+    return file_names
+
+
+def __list_directory(directory: str) -> frozenset[str] | None:
+    try:
+        return frozenset(os.path.normcase(file_name) for file_name in os.listdir(directory or os.curdir))
+    except OSError:
+        return None
+
+
+def __is_unmounted(directory: str) -> bool:
+    for mount_point in __UNMOUNTED_POINTS:
+        if __is_within(directory, mount_point):
+            return True
+
+    return False
+
+
+def __is_within(path: str, directory: str) -> bool:
+    return path == directory or path.startswith(directory.rstrip(os.sep) + os.sep)
+
+
+def __update_mount_points(now: float, force: bool=False) -> None:
+    global __MOUNT_POINTS, __UNMOUNTED_POINTS, __MOUNTS_TIME
+
+    with __LOCK:
+        if not force and __MOUNTS_TIME is not None and now - __MOUNTS_TIME < settings._FILE_AVAILABILITY_SECONDS:
+            return
+
+        __MOUNTS_TIME = now
+
+    mount_points = __read_mount_points()
+
+    with __LOCK:
+        if mount_points is None or mount_points == __MOUNT_POINTS:
+            return
+
+        changed_points = mount_points.symmetric_difference(__MOUNT_POINTS) if __MOUNT_POINTS else frozenset()
+        __UNMOUNTED_POINTS = (__UNMOUNTED_POINTS | __MOUNT_POINTS) - mount_points
+        __MOUNT_POINTS = mount_points
+
+        for mount_point in changed_points:
+            for directory in [directory for directory in __DIRECTORIES if __is_within(directory, mount_point)]:
+                del __DIRECTORIES[directory]
+
+    for mount_point in changed_points:
+        __notify_changed(mount_point)
+
+
+def __read_mount_points() -> frozenset[str] | None:
+    """Return None if the mount points are not available (not Linux)."""
+
+    try:
+        with open(_MOUNTINFO_PATH, mode='rt', encoding='utf-8', errors='surrogateescape') as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    # The fifth field is the mount point, with the spaces, etc. escaped in octal
+    return frozenset(__MOUNTINFO_ESCAPE.sub(lambda match: chr(int(match.group(1), 8)), line.split(" ", 5)[4])
+                     for line in lines if line.count(" ") >= 5)
+
+
+def __notify_changed(directory: str) -> None:
+    global __GENERATION
+
+    with __LOCK:
+        __GENERATION += 1
+        funcs = tuple(__CHANGED_FUNCS)
+
+    for func in funcs:
+        func(directory)
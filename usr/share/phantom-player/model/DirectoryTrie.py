@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+from system_utils import split_path
+from model.Video import Video
+
+
+class DirectoryTrie(object):
+    """
+        Index of the videos by directory, with a node per path component.
+
+        The videos of a directory, and of its sub-directories, are found without
+        iterating all the videos of the playlist. The components are compared as
+        a whole, so "/a/bc" is never taken as a sub-directory of "/a/b".
+
+        Each node is a tuple (children by component, videos by hash). The nodes
+        are kept once empty, there are few of them compared to the videos.
+    """
+
+    def __init__(self) -> None:
+        self.__root = ({}, {})
+        self.__nodes_by_directory = {}  # Video.get_directory(): node, so the directories are split only once
+
+    def add_video(self, video: Video) -> None:
+        self.__get_directory_node(video.get_directory())[1][video.get_hash()] = video
+
+    def remove_video(self, video: Video, directory: str | None=None) -> None:
+        """The directory must be given if the path of the video changed since it was added."""
+
+        if directory is None:
+            directory = video.get_directory()
+
+        node = self.__nodes_by_directory.get(directory)
+        if node is not None:
+            node[1].pop(video.get_hash(), None)
+
+    def get_videos(self, path: str, recursive: bool, only_children: bool=False) -> list[Video]:
+        """
+            Return the videos of the directory path (unless only_children is True),
+            and of its sub-directories if recursive is True. The order is undefined.
+        """
+
+        node = self.__root
+        for component in split_path(path):
+            node = node[0].get(component)
+            if node is None:
+                return []
+
+        videos = [] if only_children else list(node[1].values())
+
+        if recursive:
+            pending_nodes = list(node[0].values())
+            while len(pending_nodes) > 0:
+                children, directory_videos = pending_nodes.pop()
+                videos.extend(directory_videos.values())
+                pending_nodes.extend(children.values())
+
+        return videos
+
+    def __get_directory_node(self, directory: str) -> tuple[dict, dict]:
+
+        node = self.__nodes_by_directory.get(directory)
+        if node is not None:
+            return node
+
+        node = self.__root
+        for component in split_path(directory):
+            children = node[0]
+            node = children.get(component)
+            if node is None:
+                node = ({}, {})
+                children[component] = node
+
+        self.__nodes_by_directory[directory] = node
+        return node
@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+"""
+    The change events of the model, emitted by the playlists for themselves,
+    their videos and their paths. See Playlist.connect().
+"""
+
+from typing import Any, Callable, Sequence
+
+
+class EventKind:
+    _added = "added"  # A video or a playlist path was added
+    _removed = "removed"  # A video or a playlist path was removed, the old value is its former index (videos)
+    _moved = "moved"  # The videos were reordered, the old value is the (first, last) indexes that changed
+    _changed = "changed"  # A field changed, the old value is its value before the change
+
+
+class ModelEvent(object):
+
+    __slots__ = ('__kind', '__source', '__target', '__field', '__old_value')
+
+    def __init__(self, kind: str, source: Any, target: Any, field: str | None=None, old_value: Any=None) -> None:
+        self.__kind = kind
+        self.__source = source  # The playlist that emitted the event
+        self.__target = target  # The video, the playlist path or the playlist itself
+        self.__field = field
+        self.__old_value = old_value
+
+    def __repr__(self) -> str:
+        return f"ModelEvent({self.__kind}, {type(self.__target).__name__}, field={self.__field})"
+
+    def get_kind(self) -> str:
+        return self.__kind
+
+    def get_source(self) -> Any:
+        return self.__source
+
+    def get_target(self) -> Any:
+        return self.__target
+
+    def get_field(self) -> str | None:
+        return self.__field
+
+    def get_old_value(self) -> Any:
+        return self.__old_value
+
+
+class EventSource(object):
+    """The functions connected to an object, no event is created while there are none."""
+
+    def __init__(self) -> None:
+        self.__funcs = []
+
+    def __bool__(self) -> bool:
+        return len(self.__funcs) > 0
+
+    def connect(self, func: Callable[[ModelEvent], None]) -> None:
+        if func not in self.__funcs:
+            self.__funcs.append(func)
+
+    def disconnect(self, func: Callable[[ModelEvent], None]) -> None:
+        if func in self.__funcs:
+            self.__funcs.remove(func)
+
+    def emit(self, kind: str, source: Any, target: Any, field: str | None=None, old_value: Any=None) -> None:
+
+        if len(self.__funcs) == 0:
+            return
+
+        event = ModelEvent(kind, source, target, field, old_value)
+        for func in self.__funcs:
+            func(event)
+
+
+def coalesce_events(events: Sequence[ModelEvent]) -> list[ModelEvent]:
+    """
+        Return the events without the repeated changes of a field: only the first one is kept,
+        which has the oldest value, the new value is read from the target. The order is kept.
+    """
+
+    coalesced_events = []
+    changed_fields = {}  # id(target): fields
+
+    for event in events:
+        if event.get_kind() == EventKind._changed:
+            fields = changed_fields.setdefault(id(event.get_target()), set())
+            if event.get_field() in fields:
+                continue
+            fields.add(event.get_field())
+
+        elif event.get_kind() in (EventKind._added, EventKind._removed):
+            # The changes before and after it are not merged
+            changed_fields.pop(id(event.get_target()), None)
+
+        coalesced_events.append(event)
+
+    return coalesced_events
@@ -0,0 +1,366 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+
+"""
+    Index of the videos of all the playlists, by path, by hash, and by the
+    attributes that can be queried (see model/VideoQuery.py).
+
+    The playlists notify the library when a video is added, removed, renamed
+    or when its stats change, so the indexes remain consistent without scanning
+    the videos. The videos of a playlist loaded with only its headers are
+    indexed once they are loaded.
+
+    The videos change from the discovery and backfill threads while the GTK thread
+    queries them, so the indexes are only read and modified with the lock of the library.
+"""
+
+from threading import RLock
+from typing import Callable, Iterator
+
+import system_utils
+from model.Playlist import Playlist
+from model.Video import Video, calculate_percent
+from model.VideoIndex import SortedVideoIndex
+from model.VideoQuery import VideoQuery, QueryAttribute, QueryFlag, SortKey
+
+
+def _get_video_progress(video: Video) -> int:
+    return calculate_percent(video.get_progress(), video.get_duration())
+
+
+# The value of each attribute from a video, and from the stats given by VideoChange._stats
+_ATTRIBUTE_GETTERS = {QueryAttribute._rating: (Video.get_rating, lambda stats: stats[4]),
+                       QueryAttribute._duration: (Video.get_duration, lambda stats: stats[0]),
+                       QueryAttribute._size: (Video.get_size, lambda stats: stats[3]),
+                       QueryAttribute._progress: (_get_video_progress, lambda stats: calculate_percent(stats[1], stats[0]))}
+
+_EXTENSION_CRITERION = "ext"
+
+_SORT_GETTERS = {SortKey._name: Video.get_sort_key,
+                  SortKey._path: Video.get_path}
+_SORT_GETTERS.update({attribute: get_value for attribute, (get_value, _) in _ATTRIBUTE_GETTERS.items()})
+
+
+class DuplicateGroup:
+    """The videos of a hash, see Library.iter_duplicates()."""
+
+    def __init__(self, video_hash: str, videos: list[tuple[Playlist, Video]]) -> None:
+        self.__hash = video_hash
+        self.__videos = videos
+
+    def get_hash(self) -> str:
+        return self.__hash
+
+    def get_videos(self) -> list[tuple[Playlist, Video]]:
+        return self.__videos
+
+    def get_paths(self) -> list[str]:
+        """Return the distinct paths, the same file may be in multiple playlists."""
+        return list(dict.fromkeys(video.get_path() for _, video in self.__videos))
+
+    def get_wasted_size(self) -> int:
+        """Return the bytes used by the copies, all the paths except one."""
+        return max(video.get_size() for _, video in self.__videos) * (len(self.get_paths()) - 1)
+
+
+class Library(object):
+
+    def __init__(self) -> None:
+        self.__playlists_by_path = {}
+        self.__playlists_by_video = {}  # The indexed videos
+        self.__playlists = {}  # Used as an ordered set
+        self.__videos_by_extension = {}
+        self.__videos_by_hash = {}  # Hash: {video: playlist}, the same hash may be in multiple playlists
+        self.__duplicated_hashes = {}  # Used as an ordered set, the hashes with more than one video
+        self.__sorted_indexes = {attribute: SortedVideoIndex(get_value)
+                                 for attribute, (get_value, _) in _ATTRIBUTE_GETTERS.items()}
+        self.__lock = RLock()
+
+    def add_playlist(self, playlist: Playlist) -> None:
+        """Index the videos of a playlist, including the ones that will be loaded later."""
+
+        # The functions are set first, so no video is missed if the playlist is being modified by a thread
+        playlist.set_video_path_func(self.__on_video_path)
+        playlist.set_video_stats_func(self.__on_video_stats)
+
+        with self.__lock:
+            self.__playlists[playlist] = None
+
+            for video in playlist.get_videos().snapshot():
+                self.__playlists_by_path[video.get_path()] = playlist
+                self.__add_video(playlist, video)
+
+    def remove_playlist(self, playlist: Playlist) -> None:
+
+        playlist.set_video_path_func(None)
+        playlist.set_video_stats_func(None)
+
+        with self.__lock:
+            self.__playlists.pop(playlist, None)
+
+            for video in playlist.get_videos().snapshot():
+                self.__remove_path(playlist, video.get_path())
+                self.__remove_video(video)
+
+    def get_playlists(self) -> list[Playlist]:
+        with self.__lock:
+            return list(self.__playlists)
+
+    def get_video_by_path(self, path: str) -> tuple[Playlist | None, Video | None]:
+        """
+            Return the playlist and the video of a path. If multiple playlists
+            have the path, the last one that indexed it is returned.
+        """
+
+        with self.__lock:
+            playlist = self.__playlists_by_path.get(path)
+
+        if playlist is None:
+            return None, None
+
+        return playlist, playlist.get_video_by_path(path)
+
+    def get_video_playlist(self, video: Video) -> Playlist | None:
+        """Return the playlist of an indexed video, or None if it is not indexed."""
+        with self.__lock:
+            return self.__playlists_by_video.get(video)
+
+    def get_videos_by_hash(self, video_hash: str) -> list[tuple[Playlist, Video]]:
+        with self.__lock:
+            return [(playlist, video) for video, playlist in self.__videos_by_hash.get(video_hash, {}).items()]
+
+    def iter_duplicates(self) -> Iterator[DuplicateGroup]:
+        """
+            Yield the hashes that have more than one video, in multiple playlists or with
+            different paths. Only the duplicated hashes are read, they are tracked as the
+            videos are indexed.
+        """
+
+        with self.__lock:
+            groups = [DuplicateGroup(video_hash, self.get_videos_by_hash(video_hash))
+                      for video_hash in self.__duplicated_hashes]
+
+        for group in groups:
+            if len(group.get_videos()) > 1:
+                yield group
+
+    def query(self, query: VideoQuery) -> list[tuple[Playlist, Video]]:
+        """
+            Return the (playlist, video) that match a query.
+
+            The candidates are read from the most selective index (a range of a sorted index,
+            the extensions or the directory tries of the playlists), and only them are checked.
+            When they are already sorted as requested, the checks stop at the limit.
+        """
+
+        with self.__lock:
+            return self.__query(query)
+
+    def __query(self, query: VideoQuery) -> list[tuple[Playlist, Video]]:
+
+        candidates, sorted_by, indexed_criterion = self.__get_candidates(query)
+        checks = self.__get_checks(query, indexed_criterion)
+
+        sort_key = query.get_sort_key()
+        is_sorted = sort_key is None or sort_key == sorted_by
+        if sort_key is not None and is_sorted and query.get_sort_descending():
+            candidates.reverse()
+
+        limit = query.get_limit()
+        stop_at = limit if is_sorted else None
+
+        if len(checks) == 0:
+            videos = candidates if stop_at is None else candidates[:stop_at]
+        else:
+            videos = []
+            for video in candidates:
+                for check in checks:
+                    if not check(video):
+                        break
+                else:
+                    videos.append(video)
+                    if stop_at is not None and len(videos) >= stop_at:
+                        break
+
+        if not is_sorted:
+            videos.sort(key=_SORT_GETTERS[sort_key], reverse=query.get_sort_descending())
+
+        if limit is not None:
+            videos = videos[:limit]
+
+        return [(self.__playlists_by_video[video], video) for video in videos]
+
+    def __get_candidates(self, query: VideoQuery) -> tuple[list[Video], str | None, str | None]:
+        """
+            Return the videos to check, the attribute that sorts them (or None), and the
+            criterion that they already match (an attribute, "ext" or None).
+        """
+
+        # The size of each possible candidate list is known without building it
+        options = []
+
+        for attribute, (minimum, maximum) in query.get_ranges().items():
+            index = self.__sorted_indexes[attribute]
+            options.append((index.count(minimum, maximum),
+                            lambda index=index, minimum=minimum, maximum=maximum: index.get_videos(minimum, maximum),
+                            attribute))
+
+        if len(query.get_extensions()) > 0:
+            video_sets = [self.__videos_by_extension.get(extension, ()) for extension in query.get_extensions()]
+            options.append((sum(len(video_set) for video_set in video_sets),
+                            lambda: [video for video_set in video_sets for video in video_set],
+                            _EXTENSION_CRITERION))
+
+        if query.get_path() is not None:
+            # The number of videos in a path is not known, but it is most of the times selective
+            return [video
+                    for playlist in self.__playlists
+                    for video in playlist.get_videos_by_directory(query.get_path())], None, None
+
+        elif len(options) > 0:
+            _, get_videos, criterion = min(options, key=lambda option: option[0])
+            sorted_by = criterion if criterion in self.__sorted_indexes else None
+            return get_videos(), sorted_by, criterion
+
+        sort_key = query.get_sort_key()
+        if sort_key in self.__sorted_indexes:
+            return self.__sorted_indexes[sort_key].get_videos(), sort_key, None
+
+        return list(self.__playlists_by_video), None, None
+
+    def __get_checks(self, query: VideoQuery, indexed_criterion: str | None) -> list[Callable[[Video], bool]]:
+        """Return a function per criterion that the candidates do not match already, the cheapest first."""
+
+        checks = []
+
+        for attribute, (minimum, maximum) in query.get_ranges().items():
+            if attribute != indexed_criterion:
+                get_value = _ATTRIBUTE_GETTERS[attribute][0]
+                minimum = float('-inf') if minimum is None else minimum
+                maximum = float('inf') if maximum is None else maximum
+                checks.append(lambda video, get_value=get_value, minimum=minimum, maximum=maximum:
+                              minimum <= get_value(video) <= maximum)
+
+        extensions = query.get_extensions()
+        if len(extensions) > 0 and indexed_criterion != _EXTENSION_CRITERION:
+            checks.append(lambda video: video.get_extension().lower() in extensions)
+
+        path = query.get_path()
+        if path is not None:
+            checks.append(lambda video: system_utils.is_path_within(video.get_directory(), path))
+
+        text = query.get_text()
+        if text != "":
+            checks.append(lambda video: text in video.get_name().lower())
+
+        for flag, value in query.get_flags().items():
+            match flag:
+                case QueryFlag._new:
+                    checks.append(lambda video, value=value: video.get_is_new() == value)
+
+                case QueryFlag._ignored:
+                    checks.append(lambda video, value=value: video.get_ignore() == value)
+
+                case QueryFlag._missing:
+                    # The last one, it may list the directory of the video
+                    checks.append(lambda video, value=value: video.exists() != value)
+
+        return checks
+
+    def __add_video(self, playlist: Playlist, video: Video) -> None:
+
+        if video in self.__playlists_by_video:
+            return
+
+        self.__playlists_by_video[video] = playlist
+
+        for index in self.__sorted_indexes.values():
+            index.add(video)
+
+        self.__videos_by_extension.setdefault(video.get_extension().lower(), set()).add(video)
+
+        videos = self.__videos_by_hash.setdefault(video.get_hash(), {})
+        videos[video] = playlist
+        if len(videos) == 2:
+            self.__duplicated_hashes[video.get_hash()] = None
+
+    def __remove_video(self, video: Video) -> None:
+
+        if self.__playlists_by_video.pop(video, None) is None:
+            return
+
+        for index in self.__sorted_indexes.values():
+            index.remove(video)
+
+        extension = video.get_extension().lower()
+        videos = self.__videos_by_extension.get(extension)
+        if videos is not None:
+            videos.discard(video)
+            if len(videos) == 0:
+                del self.__videos_by_extension[extension]
+
+        video_hash = video.get_hash()
+        videos = self.__videos_by_hash.get(video_hash)
+        if videos is not None:
+            videos.pop(video, None)
+            if len(videos) < 2:
+                self.__duplicated_hashes.pop(video_hash, None)
+            if len(videos) == 0:
+                del self.__videos_by_hash[video_hash]
+
+    def __remove_path(self, playlist: Playlist, path: str) -> None:
+        if self.__playlists_by_path.get(path) is playlist:
+            del self.__playlists_by_path[path]
+
+    def __on_video_path(self, playlist: Playlist, video: Video, old_path: str | None, new_path: str | None) -> None:
+        """Can be called from a thread."""
+
+        with self.__lock:
+            if old_path is not None:
+                self.__remove_path(playlist, old_path)
+
+            if new_path is not None:
+                self.__playlists_by_path[new_path] = playlist
+
+            if old_path is None:
+                self.__add_video(playlist, video)
+
+            elif new_path is None:
+                self.__remove_video(video)
+
+    def __on_video_stats(self, _playlist: Playlist, video: Video, old_stats: tuple) -> None:
+        """Can be called from a thread."""
+
+        with self.__lock:
+            if video not in self.__playlists_by_video:
+                return
+
+            for attribute, (get_value, get_old_value) in _ATTRIBUTE_GETTERS.items():
+                old_value = get_old_value(old_stats)
+                if old_value != get_value(video):
+                    self.__sorted_indexes[attribute].update(video, old_value)
@@ -26,13 +26,18 @@
 # SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
 
 import os
-import random
+from bisect import bisect_left, insort
 
 import Paths
 import settings
 import system_utils
-from copy import copy
-from model.Video import Video
+import file_availability
+from typing import Callable, Iterator
+from model.Video import Video, VideoChange, calculate_percent
+from model.VideosView import VideosView
+from model.Events import EventKind, EventSource, ModelEvent
+from model.Shuffle import Shuffle
+from model.DirectoryTrie import DirectoryTrie
 from model.PlaylistPath import PlaylistPath
 from system_utils import format_img
 
@@ -50,6 +55,20 @@ class TimeValue:
     _maximum = 59 * 60 + 59
 
 
+class Summary:
+    """The aggregated values of the videos, which are saved with the headers of the playlist."""
+    _percent = "percent"  # Average watched percent of the active videos
+    _videos = "videos"
+    _active = "active"  # Videos not ignored
+    _ignored = "ignored"
+    _missing = "missing"  # Active videos whose file does not exist
+    _duration = "duration"  # Seconds of the active videos
+    _watched = "watched"  # Watched seconds of the active videos
+    _size = "size"  # Bytes of all the videos
+
+    _all = (_percent, _videos, _active, _ignored, _missing, _duration, _watched, _size)
+
+
 class Track:
     class Value:
         _disabled = -1
@@ -80,7 +99,69 @@ class Playlist(object):
         # Variables
         self.__videos_list = []
         self.__videos_dict = {}
+        self.__videos_by_path = {}
+        self.__videos_by_directory = DirectoryTrie()
+        self.__pending_indexes = None  # Sorted indexes of the pending videos, None when it must be rebuilt
+        self.__positions = {}  # The index of each video in the videos list, by hash
+        self.__stale_numbers = None  # The (first, last) indexes whose position must be written, last=None for the end
+        self.__numbers_generation = 0  # Incremented when the numbers change, without writing them
+        self.__shuffle = Shuffle()
+        self.__videos_loaded = True
+        self.__cached_summary = {}  # Read from the playlist file, used while the videos are not loaded
+
+        # The aggregates are updated as the videos are added, removed or changed, see __add_video_stats()
         self.__active_videos_nb = 0
+        self.__percent_sum = 0
+        self.__duration_sum = 0
+        self.__watched_sum = 0
+        self.__size_sum = 0
+        self.__missing_videos_nb = None  # None when it must be counted again
+        self.__missing_generation = -1  # The generation of file_availability when it was counted
+
+        # The same bound method is given to all the videos, instead of creating one per video
+        self.__video_changed_func = self.__on_video_changed
+
+        # Called with (playlist, video, old_path, new_path) when a video is added (old_path=None),
+        # removed (new_path=None) or renamed, to update the path indexes of the library.
+        self.__video_path_func = None
+
+        # Called with (playlist, video, old_stats) when the stats of a video change, see VideoChange._stats
+        self.__video_stats_func = None
+
+        # The functions connected to the change events of the playlist, its videos and its paths
+        self.__events = EventSource()
+        self.__playlist_path_changed_func = self.__on_playlist_path_changed
+
+    def __getstate__(self) -> dict:
+        # The functions are bound methods, they are set again by __setstate__
+        state = self.__dict__.copy()
+        state['_Playlist__video_changed_func'] = None
+        state['_Playlist__video_path_func'] = None
+        state['_Playlist__video_stats_func'] = None
+        state['_Playlist__events'] = None
+        state['_Playlist__playlist_path_changed_func'] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.__video_changed_func = self.__on_video_changed
+        for video in self.__videos_list:
+            video.set_changed_func(self.__video_changed_func)
+
+        self.__events = EventSource()
+        self.__playlist_path_changed_func = self.__on_playlist_path_changed
+        for playlist_path in self.__playlist_paths.values():
+            playlist_path.set_changed_func(self.__playlist_path_changed_func)
+
+    def connect(self, func: Callable[[ModelEvent], None]) -> None:
+        """
+            Call a function with each change of the playlist, of its videos and of its paths (see model/Events.py).
+            It may be called from any thread.
+        """
+        self.__events.connect(func)
+
+    def disconnect(self, func: Callable[[ModelEvent], None]) -> None:
+        self.__events.disconnect(func)
 
     def has_video(self, video:Video) -> bool:
         return video.get_hash() in self.__videos_dict
@@ -91,7 +172,7 @@ class Playlist(object):
             return False  # Playlists without paths should be displayed
 
         for path in self.__playlist_paths.keys():
-            if os.path.exists(path):
+            if file_availability.exists_directory(path):
                 return False
 
         return True
@@ -103,51 +184,115 @@ class Playlist(object):
             if playlist_path.get_path() == rec_playlist_path.get_path():
                 continue
 
-            elif playlist_path.get_path().startswith(rec_playlist_path.get_path()):
+            elif system_utils.is_path_within(playlist_path.get_path(), rec_playlist_path.get_path()):
                 return False
 
         return True
 
     def restart(self) -> None:
+        self.__pending_indexes = None  # Rebuilt once, instead of being updated for each video
+        self.__shuffle.clear()
         for video in self.__videos_list:
             video.set_progress(0)
 
-    def move(self, videos:[Video], up:bool) -> None:
+    def move(self, videos:[Video], up:bool) -> tuple[int, int] | None:
+        """
+            Move the videos one position up or down, in a single pass. If one of
+            the videos is already at the top (or bottom) none is moved.
+
+            Return the (first, last) indexes of the videos list that changed, or None.
+        """
 
         if len(self.__videos_list) == 0 or len(videos) == 0:
-            return
+            return None
+
+        selected_hashes = {video.get_hash() for video in videos}
+        videos_list = self.__videos_list
 
         if up:
-            if videos[0].get_number() <= self.__videos_list[0].get_number():
-                return
+            if videos_list[0].get_hash() in selected_hashes:
+                return None
 
-            step = -1 # move to top
+            indexes = range(1, len(videos_list))
+            step = -1
         else:
-            if videos[-1].get_number() >= self.__videos_list[-1].get_number():
-                return
+            if videos_list[-1].get_hash() in selected_hashes:
+                return None
 
-            step = 1 # move to bottom
+            indexes = range(len(videos_list) - 2, -1, -1)
+            step = 1
 
+        # Each selected video is swapped with its unselected neighbour, so a block
+        # of selected videos moves as a whole.
+        first = last = None
+        for i in indexes:
+            if videos_list[i].get_hash() in selected_hashes and videos_list[i + step].get_hash() not in selected_hashes:
+                videos_list[i], videos_list[i + step] = videos_list[i + step], videos_list[i]
 
-        for video in videos:
-            index = self.__videos_list.index(video)
-            self.__videos_list.remove(video)
-            self.__videos_list.insert(index + step, video)
+                if first is None:
+                    first = last = i
+                first = min(first, i, i + step)
+                last = max(last, i, i + step)
 
-        self.__recalculate_videos_nb()
+        if first is None:
+            return None
+
+        self.__pending_indexes = None
+        self.__recalculate_videos_nb(first, last)
+        self.__events.emit(EventKind._moved, self, self, old_value=(first, last))
+        return first, last
+
+    def move_to(self, videos:[Video], position:int) -> tuple[int, int] | None:
+        """
+            Move the videos to a position (the index of the first video once moved),
+            keeping their order in the playlist.
+
+            Return the (first, last) indexes of the videos list that changed, or None.
+        """
+
+        selected_hashes = {video.get_hash() for video in videos}
+        moved_videos = [video for video in self.__videos_list if video.get_hash() in selected_hashes]
+        other_videos = [video for video in self.__videos_list if video.get_hash() not in selected_hashes]
+
+        position = max(0, min(position, len(other_videos)))
+        videos_list = other_videos[:position] + moved_videos + other_videos[position:]
+
+        changed_indexes = [i for i, (old_video, new_video) in enumerate(zip(self.__videos_list, videos_list))
+                           if old_video is not new_video]
+        if len(changed_indexes) == 0:
+            return None
+
+        self.__videos_list = videos_list
+        self.__pending_indexes = None
+
+        first, last = changed_indexes[0], changed_indexes[-1]
+        self.__recalculate_videos_nb(first, last)
+        self.__events.emit(EventKind._moved, self, self, old_value=(first, last))
+        return first, last
+
+    def move_to_top(self, videos:[Video]) -> tuple[int, int] | None:
+        return self.move_to(videos, 0)
+
+    def move_to_bottom(self, videos:[Video]) -> tuple[int, int] | None:
+        return self.move_to(videos, len(self.__videos_list))
 
 
     def reorder_by_name(self) -> None:
         """
-            It is not possible to create a dictionary only by name
-            because multiple episodes could have the same name.
+            Sort the videos by name in natural order ("Episode 2" before "Episode 10"),
+            multiple episodes could have the same name, so they are sorted by path.
+            The keys are cached by the videos, the paths are only read when a name repeats.
         """
-        videos_data = {"{}={}".format(video.get_name(), video.get_path()): video for video in self.__videos_list}
-        self.__videos_list = []
-        for key, value in sorted(videos_data.items()):
-            self.__videos_list.append(value)
+        videos_list = self.__videos_list
+        keys = list(map(Video.get_sort_key, videos_list))
+        if len(set(keys)) < len(keys):
+            keys = list(zip(keys, map(Video.get_path, videos_list)))
+
+        self.__videos_list = [videos_list[index] for index in sorted(range(len(keys)), key=keys.__getitem__)]
 
+        self.__pending_indexes = None
         self.__recalculate_videos_nb()
+        self.__events.emit(EventKind._moved, self, self, old_value=(0, len(self.__videos_list) - 1))
 
     def requires_discover(self, is_startup:bool) -> bool:
 
@@ -162,43 +307,45 @@ class Playlist(object):
 
         return False
 
-    def remove_videos(self, videos:[Video]) -> None:
-        for video in videos:
-            self.__videos_list.remove(video)
-            del self.__videos_dict[video.get_hash()]
-
-        self.__recalculate_videos_nb()
+    def remove_videos(self, videos:[Video]) -> list[int]:
+        """
+            Remove the videos in a single pass, and return the indexes
+            that they had in the videos list (sorted).
+        """
+        return self.__remove_videos_by_hash({video.get_hash() for video in videos})
 
     def update_playlist_path(self,
                              playlist_path:PlaylistPath,
                              new_path:str) -> PlaylistPath:
 
         self.__playlist_paths.pop(playlist_path.get_path())
+        playlist_path.set_changed_func(None)
+        self.__events.emit(EventKind._removed, self, playlist_path)
 
         new_playlist_path = PlaylistPath(new_path,
                                          playlist_path.get_recursive(),
                                          playlist_path.get_startup_discover())
         self.__playlist_paths[new_playlist_path.get_path()] = new_playlist_path
+        new_playlist_path.set_changed_func(self.__playlist_path_changed_func)
+        self.__events.emit(EventKind._added, self, new_playlist_path)
 
         return new_playlist_path
 
     def remove_playlist_path(self,
                              playlist_path:PlaylistPath,
-                             only_recursive_children:bool=False) -> None:
+                             only_recursive_children:bool=False) -> [Video]:
         """
             only_recursive_children is used to remove the list of
             videos when the user deactivates "Recursive".
         """
         remove_videos = self.get_videos_by_playlist_path(playlist_path, only_recursive_children)
-        for video in remove_videos:
-            self.__videos_list.remove(video)
-            del self.__videos_dict[video.get_hash()]
-
-        self.__recalculate_videos_nb()
+        self.__remove_videos_by_hash({video.get_hash() for video in remove_videos})
 
         if not only_recursive_children:
             # The playlist path must be removed AFTER removing the videos.
             self.__playlist_paths.pop(playlist_path.get_path())
+            playlist_path.set_changed_func(None)
+            self.__events.emit(EventKind._removed, self, playlist_path)
 
         return remove_videos
 
@@ -211,10 +358,12 @@ class Playlist(object):
                 return False
 
             # if the path is already included in a recursive path
-            elif playlist_path.get_recursive() and new_playlist_path.get_path().startswith(playlist_path.get_path()):
+            elif playlist_path.get_recursive() and system_utils.is_path_within(new_playlist_path.get_path(), playlist_path.get_path()):
                 return False
 
         self.__playlist_paths[new_playlist_path.get_path()] = new_playlist_path
+        new_playlist_path.set_changed_func(self.__playlist_path_changed_func)
+        self.__events.emit(EventKind._added, self, new_playlist_path)
 
         return True
 
@@ -223,30 +372,34 @@ class Playlist(object):
         if video.get_hash() in self.__videos_dict:
             raise ValueError(f"Attempting to add a duplicated video hash {video.get_hash()}")
 
-        video.set_number(len(self.__videos_list) + 1)
+        self.__positions[video.get_hash()] = len(self.__videos_list)
         self.__videos_list.append(video)
         self.__videos_dict[video.get_hash()] = video
-        self.__active_videos_nb += 1
+        self.__add_video_stats(video.get_duration(), video.get_progress(), video.get_ignore(), video.get_size(), 1)
+        self.__missing_videos_nb = None
 
-    def get_path_stats(self, playlist_path:PlaylistPath) -> (int, int, int):
+        if video.is_pending():
+            self.__shuffle.add_video(video)
+            if self.__pending_indexes is not None:
+                self.__pending_indexes.append(len(self.__videos_list) - 1)
 
-        active = 0
-        ignored = 0
-        missing = 0
+        path = video.get_path()
+        self.__videos_by_path[path] = video
+        self.__videos_by_directory.add_video(video)
+        video.set_changed_func(self.__video_changed_func)
 
-        path = playlist_path.get_path()
-        recursive = playlist_path.get_recursive()
+        if self.__video_path_func is not None:
+            self.__video_path_func(self, video, None, path)
 
-        for video in self.__videos_list:
+        self.__events.emit(EventKind._added, self, video)
 
-            video_dirname = os.path.dirname(video.get_path())
+    def get_path_stats(self, playlist_path:PlaylistPath) -> (int, int, int):
 
-            if recursive:
-                if not video_dirname.startswith(path):
-                    continue
+        active = 0
+        ignored = 0
+        missing = 0
 
-            elif video_dirname != path:
-                continue
+        for video in self.__videos_by_directory.get_videos(playlist_path.get_path(), playlist_path.get_recursive()):
 
             if video.get_ignore():
                 ignored += 1
@@ -306,17 +459,50 @@ class Playlist(object):
 
     def get_percent(self) -> int:
 
-        total_of_videos = 0
-        total_percent = 0
-        for video in self.__videos_list:
-            if not video.get_ignore():
-                total_percent += video.get_percent()
-                total_of_videos += 1
+        if not self.__videos_loaded:
+            return self.__cached_summary.get(Summary._percent, 0)
 
-        if total_of_videos <= 0:
+        elif self.__active_videos_nb <= 0:
             return 0
 
-        return int(round(total_percent / total_of_videos))
+        return int(round(self.__percent_sum / self.__active_videos_nb))
+
+    def get_missing_videos_nb(self) -> int:
+        """Return the number of active videos whose file does not exist, counted again only when needed."""
+
+        if not self.__videos_loaded:
+            return self.__cached_summary.get(Summary._missing, 0)
+
+        generation = file_availability.get_generation()
+        if self.__missing_videos_nb is None or self.__missing_generation != generation:
+            self.__missing_videos_nb = sum(1 for video in self.__videos_list
+                                           if not video.get_ignore() and not video.exists())
+            self.__missing_generation = generation
+
+        return self.__missing_videos_nb
+
+    def get_summary(self) -> dict[str, int]:
+        """
+            Return the aggregated values of the videos (see Summary), without iterating them.
+            The missing videos are not counted, it would access the files (it is called by
+            the saves, in the main thread): the last count is returned, see get_missing_videos_nb().
+        """
+
+        if not self.__videos_loaded:
+            return {key: self.__cached_summary.get(key, 0) for key in Summary._all}
+
+        missing_videos_nb = self.__missing_videos_nb
+        if missing_videos_nb is None:
+            missing_videos_nb = self.__cached_summary.get(Summary._missing, 0)
+
+        return {Summary._percent: self.get_percent(),
+                Summary._videos: len(self.__videos_list),
+                Summary._active: self.__active_videos_nb,
+                Summary._ignored: len(self.__videos_list) - self.__active_videos_nb,
+                Summary._missing: missing_videos_nb,
+                Summary._duration: self.__duration_sum,
+                Summary._watched: self.__watched_sum,
+                Summary._size: self.__size_sum}
 
     def get_next_ordered_video(self, after=None):
         """
@@ -324,43 +510,27 @@ class Playlist(object):
 
             If a video is provided, get the video next to this one, and
             if there is no next video to the one provided, go to the beginning.
-        """
-
-        after_found = False
 
-        for video in self.__videos_list:
+            The number of the video provided is the cursor, and only the pending
+            videos are checked from there.
+        """
 
-            if after is not None:
-                if video == after:
-                    after_found = True
-                    continue
+        pending_indexes = self.__get_pending_indexes()
 
-                elif not after_found:
-                    continue
+        start = 0
+        if after is not None and self.has_video(after):
+            start = bisect_left(pending_indexes, self.get_video_number(after))
 
-            if video.exists() and not video.ended() and not video.get_ignore():
+        # From the cursor to the end, and then from the beginning
+        for position in range(start - len(pending_indexes), start):
+            video = self.__videos_list[pending_indexes[position]]
+            if video.exists():
                 return video
 
-        # Try to return a video from the beginning
-        if after is not None:
-            return self.get_next_ordered_video()
-
         return None
 
     def get_next_random_video(self) -> Video | None:
-
-        videos = []
-        for video in self.__videos_list:
-            if not video.ended() and video.exists() and not video.get_ignore():
-                videos.append(video)
-
-        if not videos:
-            return None
-
-        elif len(videos) == 1:
-            return videos[0]
-
-        return random.choice(videos)
+        return self.__shuffle.choose(self.__get_pending_videos)
 
     def get_audio_track(self) -> int:
         return self.__audio_track
@@ -371,16 +541,18 @@ class Playlist(object):
     def get_random(self) -> bool:
         return self.__random
 
+    def get_shuffle(self) -> Shuffle:
+        return self.__shuffle
+
+    def get_shuffle_mode(self) -> str:
+        return self.__shuffle.get_mode()
+
     def get_current_video_hash(self) -> str:
         """This method is called by a getattr(), do not remove it."""
         return self.__current_video_hash
 
     def get_video_by_path(self, path: str) -> Video | None:
-        for video in self.__videos_list:
-            if video.get_path() == path:
-                return video
-
-        return None
+        return self.__videos_by_path.get(path)
 
     def get_video_by_hash(self, video_hash: str) -> Video | None:
         try:
@@ -403,6 +575,10 @@ class Playlist(object):
 
         return videos
 
+    def get_videos_by_directory(self, path: str) -> list[Video]:
+        """Return the videos of a directory and of its sub-directories, in no particular order."""
+        return self.__videos_by_directory.get_videos(path, recursive=True)
+
     def get_videos_by_playlist_path(self,
                                     playlist_path:PlaylistPath,
                                     only_recursive_children:bool=False) -> [Video]:
@@ -416,35 +592,45 @@ class Playlist(object):
         if path not in self.__playlist_paths.keys():
             return []
 
-        videos = []
-        for video in self.__videos_list:
-            video_dirname = os.path.dirname(video.get_path())
-
-            if video_dirname.startswith(path):
-
-                if path == video_dirname:
-                    if not only_recursive_children:
-                        videos.append(video)
+        elif only_recursive_children and not recursive:
+            return []
 
-                elif recursive:
-                    videos.append(video)
+        self.__update_positions()
+        positions = self.__positions
+        videos = self.__videos_by_directory.get_videos(path, recursive, only_recursive_children)
+        videos.sort(key=lambda video: positions[video.get_hash()])
 
         return videos
 
     def get_last_played_video(self) -> Video | None:
         return self.get_video_by_hash(self.__current_video_hash)
 
-    def get_videos(self) -> [Video, ...]:
-        return copy(self.__videos_list)
+    def get_videos(self) -> VideosView:
+        """Return a read-only view of the videos, see model/VideosView.py. It is not a copy."""
+        return VideosView(self.__videos_list, self.get_numbers_generation)
+
+    def get_video_number(self, video: Video) -> int:
+        """Return the number of a video, its position in the playlist starting at 1."""
+        self.__update_positions()
+        return self.__positions[video.get_hash()] + 1
+
+    def get_numbers_generation(self) -> int:
+        """Return a value that changes each time that the videos are renumbered: when they are moved or removed."""
+        return self.__numbers_generation
 
     def get_keep_playing(self) -> bool:
         return self.__keep_playing
 
+    def get_videos_loaded(self) -> bool:
+        return self.__videos_loaded
+
     def set_guid(self, value: int) -> None:
         self.__number = int(value)
 
     def set_hidden(self, value: bool) -> None:
+        old_value = self.__hidden
         self.__hidden = value
+        self.__emit_changed('hidden', old_value, value)
 
     def set_load_status(self, value: LoadStatus) -> None:
         if value not in (LoadStatus._waiting_load, LoadStatus._loading, LoadStatus._loaded):
@@ -453,12 +639,32 @@ class Playlist(object):
         self.__load_status = value
 
     def set_keep_playing(self, value: bool) -> None:
+        old_value = self.__keep_playing
         self.__keep_playing = value
+        self.__emit_changed('keep_playing', old_value, value)
+
+    def set_videos_loaded(self, value: bool) -> None:
+        self.__videos_loaded = value
+
+    def set_video_path_func(self, func: Callable[['Playlist', Video, str | None, str | None], None] | None) -> None:
+        self.__video_path_func = func
+
+    def set_video_stats_func(self, func: Callable[['Playlist', Video, tuple], None] | None) -> None:
+        self.__video_stats_func = func
+
+    def set_cached_summary_value(self, key: str, value: int) -> None:
+        if key not in Summary._all:
+            raise ValueError("wrong summary key={}".format(key))
+
+        self.__cached_summary[key] = int(value)
 
     def set_current_video_hash(self, value: str) -> None:
+        old_value = self.__current_video_hash
         self.__current_video_hash = str(value)
+        self.__emit_changed('current_video_hash', old_value, self.__current_video_hash)
 
     def set_start_at(self, value: int) -> None:
+        old_value = self.__start_at
         try:
             value = int(value)
         except Exception as e:
@@ -475,6 +681,8 @@ class Playlist(object):
         else:
             self.__start_at = TimeValue._minium
 
+        self.__emit_changed('start_at', old_value, self.__start_at)
+
     def set_audio_track(self, value: int) -> None:
         try:
             value = int(value)
@@ -484,7 +692,9 @@ class Playlist(object):
             print(str(e))
             value = Track.Value._undefined
 
+        old_value = self.__audio_track
         self.__audio_track = value
+        self.__emit_changed('audio_track', old_value, value)
 
     def set_subtitles_track(self, value: int) -> None:
         try:
@@ -495,10 +705,19 @@ class Playlist(object):
             print(str(e))
             value = Track.Value._undefined
 
+        old_value = self.__subtitles_track
         self.__subtitles_track = value
+        self.__emit_changed('subtitles_track', old_value, value)
 
     def set_random(self, is_random: bool) -> None:
+        old_value = self.__random
         self.__random = is_random
+        self.__emit_changed('random', old_value, is_random)
+
+    def set_shuffle_mode(self, mode: str) -> None:
+        old_value = self.__shuffle.get_mode()
+        self.__shuffle.set_mode(mode)
+        self.__emit_changed('shuffle_mode', old_value, self.__shuffle.get_mode())
 
     def set_name(self, new_name: str, force: bool = False) -> None:
         """
@@ -517,7 +736,9 @@ class Playlist(object):
         old_icon_path = self.get_icon_path(allow_default=False)
         old_save_path = self.get_save_path()
 
+        old_name = self.__name
         self.__name = new_name
+        self.__emit_changed('name', old_name, new_name)
 
         if os.path.exists(old_save_path):
             os.rename(old_save_path, self.get_save_path())
@@ -547,6 +768,166 @@ class Playlist(object):
                    height=settings.IconSize.Big._height,
                    extension="png")
 
-    def __recalculate_videos_nb(self) -> None:
-        for i, video in enumerate(self.__videos_list, 1):
-            video.set_number(i)
+    def __remove_videos_by_hash(self, videos_hash: set[str]) -> list[int]:
+
+        removed_indexes = []
+        removed_videos = []
+        kept_videos = []
+
+        for i, video in enumerate(self.__videos_list):
+            if video.get_hash() in videos_hash:
+                removed_indexes.append(i)
+                removed_videos.append(video)
+                del self.__videos_dict[video.get_hash()]
+                del self.__positions[video.get_hash()]
+                self.__shuffle.discard_hash(video.get_hash())
+                self.__add_video_stats(video.get_duration(), video.get_progress(), video.get_ignore(), video.get_size(), -1)
+                self.__unindex_video_path(video)
+            else:
+                kept_videos.append(video)
+
+        if len(removed_indexes) == 0:
+            return removed_indexes
+
+        self.__videos_list = kept_videos
+        self.__pending_indexes = None
+        self.__missing_videos_nb = None
+
+        # The videos before the first removed one keep their number
+        self.__recalculate_videos_nb(removed_indexes[0])
+
+        if self.__events:
+            for index, video in zip(removed_indexes, removed_videos):
+                self.__events.emit(EventKind._removed, self, video, old_value=index)
+
+        return removed_indexes
+
+    def __unindex_video_path(self, video: Video) -> None:
+        path = video.get_path()
+        if self.__videos_by_path.get(path) is video:
+            del self.__videos_by_path[path]
+
+        self.__videos_by_directory.remove_video(video)
+        video.set_changed_func(None)
+
+        if self.__video_path_func is not None:
+            self.__video_path_func(self, video, path, None)
+
+    def __add_video_stats(self, duration: int, progress: int, ignore: bool, size: int, sign: int) -> None:
+        """Add (sign=1) or subtract (sign=-1) the values of a video to the aggregates."""
+
+        self.__size_sum += sign * size
+
+        if not ignore:
+            self.__active_videos_nb += sign
+            self.__percent_sum += sign * calculate_percent(progress, duration)
+            self.__duration_sum += sign * duration
+            self.__watched_sum += sign * min(progress, duration)
+
+    def __on_video_changed(self, video: Video, change: int, old_value: str | tuple | None) -> None:
+
+        match change:
+            case VideoChange._path:
+                old_path = old_value
+                self.__missing_videos_nb = None
+
+                if self.__videos_by_path.get(old_path) is video:
+                    del self.__videos_by_path[old_path]
+
+                new_path = video.get_path()
+                self.__videos_by_path[new_path] = video
+
+                self.__videos_by_directory.remove_video(video, old_path[:len(old_path) - len(os.path.basename(old_path))])
+                self.__videos_by_directory.add_video(video)
+
+                if self.__video_path_func is not None:
+                    self.__video_path_func(self, video, old_path, new_path)
+
+                self.__events.emit(EventKind._changed, self, video, 'path', old_path)
+
+            case VideoChange._stats:
+                old_duration, old_progress, old_ignore, old_size, _old_rating = old_value
+                self.__add_video_stats(old_duration, old_progress, old_ignore, old_size, -1)
+                self.__add_video_stats(video.get_duration(), video.get_progress(), video.get_ignore(), video.get_size(), 1)
+
+                if old_ignore != video.get_ignore():
+                    self.__missing_videos_nb = None
+
+                if self.__video_stats_func is not None:
+                    self.__video_stats_func(self, video, old_value)
+
+                if self.__events:
+                    new_value = (video.get_duration(), video.get_progress(), video.get_ignore(), video.get_size(), video.get_rating())
+                    for field, old_field_value, new_field_value in zip(VideoChange._stats_fields, old_value, new_value):
+                        if old_field_value != new_field_value:
+                            self.__events.emit(EventKind._changed, self, video, field, old_field_value)
+
+                was_pending = not old_ignore and old_progress < old_duration
+                if was_pending == video.is_pending() or self.__videos_dict.get(video.get_hash()) is not video:
+                    return  # A removed video may still notify its changes
+
+                elif video.is_pending():
+                    self.__shuffle.add_video(video)
+                else:
+                    self.__shuffle.discard_video(video)
+
+                if self.__pending_indexes is None:
+                    return
+
+                self.__update_positions()
+                index = self.__positions[video.get_hash()]
+                if video.is_pending():
+                    insort(self.__pending_indexes, index)
+                else:
+                    position = bisect_left(self.__pending_indexes, index)
+                    if position < len(self.__pending_indexes) and self.__pending_indexes[position] == index:
+                        del self.__pending_indexes[position]
+
+    def __on_playlist_path_changed(self, playlist_path: PlaylistPath, field: str, old_value: bool) -> None:
+        self.__events.emit(EventKind._changed, self, playlist_path, field, old_value)
+
+    def __emit_changed(self, field: str, old_value, value) -> None:
+        """Emit the change of a field of the playlist, if its value changed."""
+        if old_value != value:
+            self.__events.emit(EventKind._changed, self, self, field, old_value)
+
+    def __get_pending_indexes(self) -> list[int]:
+        if self.__pending_indexes is None:
+            self.__pending_indexes = [i for i, video in enumerate(self.__videos_list) if video.is_pending()]
+
+        return self.__pending_indexes
+
+    def __get_pending_videos(self) -> Iterator[Video]:
+        """Read by the shuffle when its candidates are reset, once per bag."""
+        return filter(Video.is_pending, self.__videos_list)
+
+    def __recalculate_videos_nb(self, first: int=0, last: int | None=None) -> None:
+        """
+            Mark the positions of the videos from the index first to last (included, None for the end)
+            as stale. They are written once, when a number is read, see __update_positions().
+        """
+
+        if self.__stale_numbers is not None:
+            stale_first, stale_last = self.__stale_numbers
+            first = min(first, stale_first)
+            last = None if last is None or stale_last is None else max(last, stale_last)
+
+        self.__stale_numbers = (first, last)
+        self.__numbers_generation += 1
+
+    def __update_positions(self) -> None:
+        """Write the stale positions, it only compares a value when they are up to date."""
+
+        if self.__stale_numbers is None:
+            return
+
+        first, last = self.__stale_numbers
+        self.__stale_numbers = None
+
+        videos_list = self.__videos_list
+        if last is None or last >= len(videos_list):
+            last = len(videos_list) - 1
+
+        positions = self.__positions
+        for i in range(first, last + 1):
+            positions[videos_list[i].get_hash()] = i
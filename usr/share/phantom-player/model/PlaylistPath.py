@@ -25,6 +25,8 @@
 #
 # SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
 
+from typing import Callable
+
 
 class PlaylistPath:
 
@@ -44,6 +46,14 @@ class PlaylistPath:
         self.__recursive = recursive
         self.__startup_discover = startup_discover
 
+        # Called with (playlist_path, field, old_value) when a field changes, it is set by the playlist
+        self.__changed_func = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['_PlaylistPath__changed_func'] = None
+        return state
+
     def get_path(self) -> str:
         return self.__path
 
@@ -53,8 +63,17 @@ class PlaylistPath:
     def get_startup_discover(self) -> bool:
         return self.__startup_discover
 
+    def set_changed_func(self, func: Callable[['PlaylistPath', str, bool], None] | None) -> None:
+        self.__changed_func = func
+
     def set_recursive(self, value: bool) -> None:
+        old_value = self.__recursive
         self.__recursive = value
+        if self.__changed_func is not None and old_value != value:
+            self.__changed_func(self, 'recursive', old_value)
 
     def set_startup_discover(self, value: bool) -> None:
+        old_value = self.__startup_discover
         self.__startup_discover = value
+        if self.__changed_func is not None and old_value != value:
+            self.__changed_func(self, 'startup_discover', old_value)
@@ -0,0 +1,193 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+import random
+from typing import Callable, Iterable
+
+from model.Video import Video
+from console_printer import print_warning
+
+# The ratings are given with 5 stars, see view/cellrenderers/CellRendererRating.py
+_MAX_RATING = 5
+
+
+class ShuffleMode:
+    _random = "random"  # Any pending video, it may be repeated
+    _bag = "bag"  # Every pending video is played once before any of them is repeated
+    _rating = "rating"  # Like bag, but the videos with a better rating are played earlier
+    _unwatched = "unwatched"  # Like bag, but the less watched videos are played earlier
+
+    _all = (_random, _bag, _rating, _unwatched)
+
+
+class Shuffle(object):
+    """
+        Choose the random videos of a playlist.
+
+        The candidates are the pending videos, which are indexed by the playlist.
+        Except in the random mode, the hashes of the chosen videos are kept until
+        all the candidates were played (a "bag"), so they are not repeated.
+
+        The candidates are kept in a list, read once from the playlist and then
+        updated by it when a video starts or stops being pending, so a video is
+        chosen without reading the others. The weighted modes accept a random
+        candidate with a probability proportional to its weight.
+    """
+
+    def __init__(self) -> None:
+        self.__mode = ShuffleMode._bag
+        self.__played_hashes = set()
+        self.__candidates = None  # The videos that can be chosen, None when they must be read again
+        self.__candidate_positions = {}  # Hash: index in __candidates
+
+    def choose(self, get_pending_videos: Callable[[], Iterable[Video]]) -> Video | None:
+        """get_pending_videos is only called when the candidates must be read again."""
+
+        if self.__candidates is None:
+            self.__set_candidates(get_pending_videos())
+
+        if len(self.__candidates) == 0 and len(self.__played_hashes) > 0:
+            # All the videos of the bag were played, start a new one
+            self.clear()
+            self.__set_candidates(get_pending_videos())
+
+        candidates = self.__candidates
+        max_weight = self.__get_max_weight()
+
+        # The missing videos are moved after the end, until one exists
+        end = len(candidates)
+        while end > 0:
+            position = random.randrange(end)
+            video = candidates[position]
+
+            if max_weight is not None and random.random() * max_weight >= self.__get_weight(video):
+                continue  # Rejected, so each candidate is chosen in proportion to its weight
+
+            if video.exists():
+                if self.__mode != ShuffleMode._random:
+                    self.add_played_hash(video.get_hash())
+                return video
+
+            end -= 1
+            self.__swap_candidates(position, end)
+
+        return None
+
+    def clear(self) -> None:
+        self.__played_hashes.clear()
+        self.__candidates = None
+
+    def add_video(self, video: Video) -> None:
+        """Add a video that became pending."""
+
+        if self.__candidates is None or video.get_hash() in self.__candidate_positions:
+            return
+
+        elif self.__mode != ShuffleMode._random and video.get_hash() in self.__played_hashes:
+            return
+
+        self.__candidate_positions[video.get_hash()] = len(self.__candidates)
+        self.__candidates.append(video)
+
+    def discard_video(self, video: Video) -> None:
+        """Discard a video that is no longer pending."""
+        self.__discard_candidate(video.get_hash())
+
+    def discard_hash(self, video_hash: str) -> None:
+        self.__played_hashes.discard(video_hash)
+        self.__discard_candidate(video_hash)
+
+    def get_mode(self) -> str:
+        return self.__mode
+
+    def get_played_hashes(self) -> set[str]:
+        return self.__played_hashes
+
+    def set_mode(self, mode: str) -> None:
+        if mode not in ShuffleMode._all:
+            print_warning(f"Unknown shuffle mode={mode}, mode={self.__mode} kept")
+
+        elif mode != self.__mode:
+            self.__mode = mode
+            self.clear()
+
+    def add_played_hash(self, video_hash: str) -> None:
+        self.__played_hashes.add(video_hash)
+        if self.__mode != ShuffleMode._random:
+            self.__discard_candidate(video_hash)
+
+    def __set_candidates(self, videos: Iterable[Video]) -> None:
+
+        if self.__mode == ShuffleMode._random:
+            self.__candidates = list(videos)
+        else:
+            self.__candidates = [video for video in videos if video.get_hash() not in self.__played_hashes]
+
+        self.__candidate_positions = {video.get_hash(): position for position, video in enumerate(self.__candidates)}
+
+    def __discard_candidate(self, video_hash: str) -> None:
+
+        if self.__candidates is None:
+            return
+
+        position = self.__candidate_positions.get(video_hash)
+        if position is None:
+            return
+
+        # The last candidate takes its position
+        self.__swap_candidates(position, len(self.__candidates) - 1)
+        self.__candidates.pop()
+        del self.__candidate_positions[video_hash]
+
+    def __swap_candidates(self, position: int, other_position: int) -> None:
+        candidates = self.__candidates
+        candidates[position], candidates[other_position] = candidates[other_position], candidates[position]
+        self.__candidate_positions[candidates[position].get_hash()] = position
+        self.__candidate_positions[candidates[other_position].get_hash()] = other_position
+
+    def __get_max_weight(self) -> int | None:
+        """Return None when all the videos have the same weight."""
+
+        match self.__mode:
+            case ShuffleMode._rating:
+                return 1 + _MAX_RATING
+
+            case ShuffleMode._unwatched:
+                return 101
+
+        return None
+
+    def __get_weight(self, video: Video) -> int:
+
+        match self.__mode:
+            case ShuffleMode._rating:
+                return 1 + max(0, min(video.get_rating(), _MAX_RATING))
+
+            case ShuffleMode._unwatched:
+                return max(1, 101 - video.get_percent())
+
+        return 1
@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+import Paths
+import system_utils
+from model.Video import Video
+from model.Playlist import Playlist
+from model.Library import Library, _SORT_GETTERS
+from model.VideoQuery import VideoQuery, parse_query
+
+_SAVE_EXTENSION = '.smart'
+
+
+class SmartPlaylist(object):
+    """
+        A saved query over the videos of all the playlists of a library.
+
+        It only lists the videos that match the query: the query is run against the
+        indexes of the library each time that the videos are read, so there is nothing
+        to keep up to date. The progress remains in the videos of their playlists,
+        see get_video_playlist().
+    """
+
+    def __init__(self, library: Library, query_text: str="") -> None:
+        self.__library = library
+        self.__name = ""
+        self.__query_text = ""
+        self.__query = VideoQuery()
+
+        self.set_query_text(query_text)
+
+    def get_name(self) -> str:
+        return self.__name
+
+    def get_save_path(self) -> str:
+        return system_utils.join_path(Paths._SERIES_DIR, self.__name + _SAVE_EXTENSION)
+
+    def get_query_text(self) -> str:
+        return self.__query_text
+
+    def get_query(self) -> VideoQuery:
+        return self.__query
+
+    def get_videos(self) -> list[Video]:
+        """Return the videos, sorted by the sort key of the query, or by playlist name and number."""
+
+        matches = self.__library.query(self.__query)
+
+        sort_key = self.__query.get_sort_key()
+        if sort_key is not None:
+            get_value = _SORT_GETTERS[sort_key]
+            matches.sort(key=lambda match: get_value(match[1]), reverse=self.__query.get_sort_descending())
+        else:
+            matches.sort(key=lambda match: (match[0].get_name().lower(), match[0].get_video_number(match[1])))
+
+        return [video for _, video in matches]
+
+    def get_video_playlist(self, video: Video) -> Playlist | None:
+        """Return the playlist that contains a video, it is the one to save after a change."""
+        return self.__library.get_video_playlist(video)
+
+    def set_name(self, name: str) -> None:
+        if name.lower().endswith(_SAVE_EXTENSION):
+            name = name.rsplit(".", 1)[0]
+
+        self.__name = name
+
+    def set_query_text(self, text: str) -> None:
+        """Raise ValueError if the query is not valid, see model/VideoQuery.py."""
+        self.__query = parse_query(text)
+        self.__query_text = text.strip()
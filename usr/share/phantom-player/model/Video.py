@@ -26,12 +26,78 @@
 # SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
 
 import os
+import re
+import sys
+import unicodedata
+from typing import Callable
 
+import file_availability
 from console_printer import print_warning
 
 
+class VideoChange:
+    _path = 0  # The old path is given
+    _stats = 1  # The duration, progress, ignore, size or rating changed, the old (duration, progress, ignore, size, rating) are given
+
+    _stats_fields = ('duration', 'progress', 'ignore', 'size', 'rating')  # The fields of the old value of _stats
+
+
+def calculate_percent(progress: int, duration: int) -> int:
+    """Return the watched percent, 100 is only returned when the progress reached the duration."""
+
+    if duration <= 0:
+        return 0
+
+    percent = int(progress / duration * 100)
+
+    if percent > 100:
+        percent = 100
+
+    elif percent == 100 and progress < duration:
+        percent = 99
+
+    return percent
+
+
+# The numbers of the natural keys are padded to this width, so they sort by value
+_NATURAL_NUMBER_WIDTH = 20
+
+__DIGITS = re.compile(r"[0-9]+")
+
+
+def get_natural_key(text: str) -> str:
+    """
+        Return a key that sorts the texts in natural order: without case, without accents,
+        and with the numbers by value ("Episode 2" before "Episode 10"). The keys are strings,
+        so they are compared by C code, in Python and in the list stores.
+    """
+
+    text = text.casefold()
+    if not text.isascii():
+        text = "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+
+    return __DIGITS.sub(lambda number: number.group().zfill(_NATURAL_NUMBER_WIDTH), text)
+
+
 class Video(object):
 
+    # There may be millions of videos, so they have no __dict__. The path is split
+    # into its directory and its file name, and the directories & extensions are
+    # interned: they are shared by all the videos instead of being repeated.
+    __slots__ = ('__hash',
+                 '__directory',
+                 '__file_name',
+                 '__name',
+                 '__extension',
+                 '__is_new',
+                 '__ignore',
+                 '__duration',
+                 '__size',
+                 '__progress',
+                 '__rating',
+                 '__sort_key',
+                 '__changed_func')
+
     def __init__(self,
                  vhash: str,
                  path: str,
@@ -41,7 +107,8 @@ class Video(object):
             raise ValueError("Can not add a video with an empty hash.")
 
         self.__hash = vhash
-        self.__path = path
+        self.__directory = ""
+        self.__file_name = ""
         self.__name = name
         self.__extension = ""
         self.__is_new = False
@@ -49,34 +116,55 @@ class Video(object):
 
         self.__duration = 0
         self.__size = 0
-        self.__number = -1
         self.__progress = 0
         self.__rating = 0
+        self.__sort_key = None  # Cache of get_sort_key(), None until it is read or when the name changes
+
+        # Called with (video, VideoChange, old value) to update the indexes & aggregates of the playlist
+        self.__changed_func = None
 
         #
         # Initialize the attributes
         #
 
-        path_basename = os.path.basename(self.__path)
+        self.__split_path(path)
+
+        path_basename = self.__file_name
         if '.' in path_basename:
             name, extension = path_basename.rsplit(".", 1)
             if len(extension) <= 4:
-                self.__extension = extension
+                self.__extension = sys.intern(extension)
                 if self.__name == "":
                     self.__name = name
 
         elif self.__name == "":
             self.__name = path_basename
 
+    def __getstate__(self) -> dict:
+        # The path changed function is set again when the video is added to a playlist
+        return {slot: getattr(self, "_Video" + slot) for slot in self.__slots__ if slot != '__changed_func'}
+
+    def __setstate__(self, state: dict) -> None:
+        for slot, value in state.items():
+            setattr(self, "_Video" + slot, value)
+
+        self.__changed_func = None
+
     def exists(self) -> bool:
-        return os.path.exists(self.__path)
+        return file_availability.exists(self.get_path())
 
     def end_progress(self):
+        old_stats = self.__get_stats()
         self.__progress = self.__duration
+        self.__notify_stats(old_stats)
 
     def ended(self) -> bool:
         return self.__progress >= self.__duration
 
+    def is_pending(self) -> bool:
+        """Return if the video remains to be played: not ended and not ignored."""
+        return not self.__ignore and self.__progress < self.__duration
+
     def get_rating(self) -> int:
         return self.__rating
 
@@ -92,14 +180,26 @@ class Video(object):
     def get_full_name(self) -> str:
         return self.__name + "." + self.__extension
 
-    def get_number(self) -> int:
-        return self.__number
+    def get_sort_key(self) -> str:
+        """Return the natural key of the name, see get_natural_key(). It is computed once."""
+
+        if self.__sort_key is None:
+            self.__sort_key = get_natural_key(self.__name)
+
+        return self.__sort_key
 
     def get_ignore(self) -> bool:
         return self.__ignore
 
     def get_path(self) -> str:
-        return self.__path
+        return self.__directory + self.__file_name
+
+    def get_directory(self) -> str:
+        """Return the directory of the video, with its trailing separator."""
+        return self.__directory
+
+    def get_file_name(self) -> str:
+        return self.__file_name
 
     def get_hash(self) -> str:
         return self.__hash
@@ -109,19 +209,10 @@ class Video(object):
 
     def get_percent(self) -> int:
 
-        if self.__duration <= 0:
-            return 0
-
-        percent = int(self.__progress / self.__duration * 100)
-
-        if percent > 100:
-            print_warning(f"un-valid percent={percent}, duration={self.__duration}. progress={self.__progress}\n path={self.__path}")
-            percent = 100
-
-        elif percent == 100 and not self.ended():
-            percent = 99
+        if self.__duration > 0 and (percent := int(self.__progress / self.__duration * 100)) > 100:
+            print_warning(f"un-valid percent={percent}, duration={self.__duration}. progress={self.__progress}\n path={self.get_path()}")
 
-        return percent
+        return calculate_percent(self.__progress, self.__duration)
 
     def get_is_new(self) -> bool:
         return self.__is_new
@@ -131,34 +222,68 @@ class Video(object):
 
     def set_size(self, bytes_nb: int) -> None:
         if bytes_nb >= 0:
+            old_stats = self.__get_stats()
             self.__size = bytes_nb
+            self.__notify_stats(old_stats)
 
     def set_duration(self, seconds: int) -> None:
         if seconds >= 0:
+            old_stats = self.__get_stats()
             self.__duration = seconds
+            self.__notify_stats(old_stats)
 
     def set_rating(self, value: int) -> None:
+        old_stats = self.__get_stats()
         self.__rating = int(value)
+        self.__notify_stats(old_stats)
 
     def set_path(self, path: str) -> None:
-        self.__path = path
+        old_path = self.get_path()
+
+        self.__split_path(path)
         if self.__name == "":
-            self.__name = os.path.basename(path)
+            self.__name = self.__file_name
+            self.__sort_key = None
+
+        if path != old_path:
+            file_availability.invalidate(old_path)
+            file_availability.invalidate(path)
+
+            if self.__changed_func is not None:
+                self.__changed_func(self, VideoChange._path, old_path)
+
+    def set_changed_func(self, func: Callable[['Video', int, str | None], None] | None) -> None:
+        self.__changed_func = func
 
     def set_is_new(self, value: bool) -> None:
         self.__is_new = value
 
     def set_progress(self, value: int) -> None:
+        old_stats = self.__get_stats()
         self.__progress = int(value)
+        self.__notify_stats(old_stats)
 
     def set_ignore(self, value: bool) -> None:
+        old_stats = self.__get_stats()
         self.__ignore = value
-
-    def set_number(self, value: int) -> None:
-        if int(value) < 0:
-            raise ValueError("video number error " + self.__name)
-        else:
-            self.__number = int(value)
+        self.__notify_stats(old_stats)
 
     def set_name(self, name: str) -> None:
         self.__name = name
+        self.__sort_key = None
+
+    def __split_path(self, path: str) -> None:
+        self.__file_name = os.path.basename(path)
+        self.__directory = sys.intern(path[:len(path) - len(self.__file_name)])
+
+    def __get_stats(self) -> tuple[int, int, bool, int, int] | None:
+        """Return the values aggregated & indexed by the playlist, or None if nobody is notified of their changes."""
+
+        if self.__changed_func is None:
+            return None
+
+        return self.__duration, self.__progress, self.__ignore, self.__size, self.__rating
+
+    def __notify_stats(self, old_stats: tuple[int, int, bool, int, int] | None) -> None:
+        if old_stats is not None and old_stats != self.__get_stats():
+            self.__changed_func(self, VideoChange._stats, old_stats)
@@ -0,0 +1,142 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+from typing import Callable
+
+from model.Video import Video
+from console_printer import print_warning
+
+# Below this number of added videos, they are inserted one by one instead of sorting all the index
+_BULK_SORT_SIZE = 64
+
+
+class SortedVideoIndex(object):
+    """
+        Videos sorted by an integer value, so the videos of a range of values are found by bisection.
+
+        The ties are sorted by id(), so each video has a single position, and it can be found
+        (and removed) with its old value once it changed. Only the videos are stored, 8 bytes
+        per video, the values are read from them.
+
+        The videos added in bulk (when a playlist is loaded) are sorted at the next access.
+        It has no lock, the library reads and modifies it with its own lock.
+    """
+
+    def __init__(self, get_value: Callable[[Video], int]) -> None:
+        self.__get_value = get_value
+        self.__videos = []
+        self.__unsorted_videos = {}  # Used as an ordered set
+
+    def add(self, video: Video) -> None:
+        self.__unsorted_videos[video] = None
+
+    def remove(self, video: Video) -> None:
+        if video in self.__unsorted_videos:
+            del self.__unsorted_videos[video]
+        else:
+            self.__remove(video, self.__get_value(video))
+
+    def update(self, video: Video, old_value: int) -> None:
+        """Move a video whose value was old_value."""
+
+        if video in self.__unsorted_videos:
+            return  # It will be sorted with its current value
+
+        self.__remove(video, old_value)
+        self.__videos.insert(self.__bisect(self.__get_value(video), id(video)), video)
+
+    def count(self, minimum: int | None=None, maximum: int | None=None) -> int:
+        first, last = self.__get_range_positions(minimum, maximum)
+        return last - first
+
+    def get_videos(self, minimum: int | None=None, maximum: int | None=None) -> list[Video]:
+        """Return the videos whose value is between minimum and maximum (included), sorted by value."""
+        first, last = self.__get_range_positions(minimum, maximum)
+        return self.__videos[first:last]
+
+    def __get_range_positions(self, minimum: int | None, maximum: int | None) -> tuple[int, int]:
+        self.__sort()
+
+        first = 0 if minimum is None else self.__bisect(minimum, -1)
+        last = len(self.__videos) if maximum is None else self.__bisect(maximum, float('inf'))
+
+        return first, max(first, last)
+
+    def __bisect(self,
+                 value: int,
+                 video_id: int | float,
+                 changed_video: Video | None=None,
+                 changed_value: int | None=None) -> int:
+        """
+            Return the position of (value, video_id). The value of changed_video is taken
+            as changed_value, because it is still sorted with its value before a change.
+        """
+
+        videos = self.__videos
+        get_value = self.__get_value
+        searched_key = (value, video_id)
+
+        low = 0
+        high = len(videos)
+        while low < high:
+            middle = (low + high) // 2
+            video = videos[middle]
+            video_value = changed_value if video is changed_video else get_value(video)
+
+            if (video_value, id(video)) < searched_key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def __remove(self, video: Video, value: int) -> None:
+
+        position = self.__bisect(value, id(video), video, value)
+
+        if position < len(self.__videos) and self.__videos[position] is video:
+            del self.__videos[position]
+        else:
+            print_warning(f"video hash={video.get_hash()} not found at its position, value={value}")
+            if video in self.__videos:
+                self.__videos.remove(video)
+
+    def __sort(self) -> None:
+
+        if len(self.__unsorted_videos) == 0:
+            return
+
+        unsorted_videos = self.__unsorted_videos
+        self.__unsorted_videos = {}
+
+        if len(unsorted_videos) < _BULK_SORT_SIZE:
+            for video in unsorted_videos:
+                self.__videos.insert(self.__bisect(self.__get_value(video), id(video)), video)
+        else:
+            get_value = self.__get_value
+            self.__videos.extend(unsorted_videos)
+            self.__videos.sort(key=lambda video: (get_value(video), id(video)))
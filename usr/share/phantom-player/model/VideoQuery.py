@@ -0,0 +1,254 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+"""
+    Criteria to filter and sort the videos of the library, see Library.query().
+
+    A query can be written as text, with space-separated terms:
+
+        rating>=4 duration<20m size>1G progress=0 ext:mkv,mp4 is:new not:missing
+        is:started path:/media/series sort:-size limit:10 some words of the name
+
+    The terms are combined with "and". The words that are not terms are searched
+    in the names of the videos.
+"""
+
+import re
+import shlex
+
+
+class QueryAttribute:
+    """The integer attributes of the videos, which are indexed by the library."""
+    _rating = "rating"
+    _duration = "duration"  # Seconds
+    _size = "size"  # Bytes
+    _progress = "progress"  # Percent
+
+    _all = (_rating, _duration, _size, _progress)
+
+
+class QueryFlag:
+    _new = "new"
+    _missing = "missing"
+    _ignored = "ignored"
+
+    _all = (_new, _missing, _ignored)
+
+
+class ProgressState:
+    _unwatched = "unwatched"
+    _started = "started"
+    _ended = "ended"
+
+    _all = (_unwatched, _started, _ended)
+
+
+class SortKey:
+    _name = "name"
+    _path = "path"
+
+    _all = QueryAttribute._all + (_name, _path)
+
+
+# The units accepted after the numbers, for each attribute
+__UNITS = {QueryAttribute._duration: {"": 1, "s": 1, "m": 60, "h": 3600},
+           QueryAttribute._size: {"": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}}
+
+__RANGE_TERM = re.compile(r"^([a-z]+)(>=|<=|>|<|=)([0-9]+)([a-z]*)$")
+
+
+class VideoQuery(object):
+
+    def __init__(self) -> None:
+        self.__ranges = {}  # QueryAttribute: (minimum, maximum), included, None when not bounded
+        self.__extensions = set()
+        self.__flags = {}  # QueryFlag: the expected value
+        self.__path = None
+        self.__text = ""
+        self.__sort_key = None
+        self.__sort_descending = False
+        self.__limit = None
+
+    def has_criteria(self) -> bool:
+        """Return if the query has other criteria than the text."""
+        return len(self.__ranges) > 0 or len(self.__extensions) > 0 or len(self.__flags) > 0 or \
+               self.__path is not None or self.__sort_key is not None or self.__limit is not None
+
+    def get_ranges(self) -> dict[str, tuple[int | None, int | None]]:
+        return self.__ranges
+
+    def get_extensions(self) -> set[str]:
+        return self.__extensions
+
+    def get_flags(self) -> dict[str, bool]:
+        return self.__flags
+
+    def get_path(self) -> str | None:
+        return self.__path
+
+    def get_text(self) -> str:
+        return self.__text
+
+    def get_sort_key(self) -> str | None:
+        return self.__sort_key
+
+    def get_sort_descending(self) -> bool:
+        return self.__sort_descending
+
+    def get_limit(self) -> int | None:
+        return self.__limit
+
+    def set_range(self, attribute: str, minimum: int | None=None, maximum: int | None=None) -> None:
+        """Restrict an attribute between minimum and maximum (included), it is combined with the previous range."""
+
+        if attribute not in QueryAttribute._all:
+            raise ValueError(f"wrong attribute={attribute}")
+
+        current_minimum, current_maximum = self.__ranges.get(attribute, (None, None))
+
+        if current_minimum is not None and (minimum is None or current_minimum > minimum):
+            minimum = current_minimum
+
+        if current_maximum is not None and (maximum is None or current_maximum < maximum):
+            maximum = current_maximum
+
+        self.__ranges[attribute] = (minimum, maximum)
+
+    def set_progress_state(self, state: str) -> None:
+        match state:
+            case ProgressState._unwatched:
+                self.set_range(QueryAttribute._progress, maximum=0)
+
+            case ProgressState._started:
+                self.set_range(QueryAttribute._progress, minimum=1, maximum=99)
+
+            case ProgressState._ended:
+                self.set_range(QueryAttribute._progress, minimum=100)
+
+            case _:
+                raise ValueError(f"wrong progress state={state}")
+
+    def add_extension(self, extension: str) -> None:
+        self.__extensions.add(extension.lower().lstrip("."))
+
+    def set_flag(self, flag: str, value: bool) -> None:
+        if flag not in QueryFlag._all:
+            raise ValueError(f"wrong flag={flag}")
+
+        self.__flags[flag] = value
+
+    def set_path(self, path: str) -> None:
+        self.__path = path
+
+    def set_text(self, text: str) -> None:
+        self.__text = text.lower().strip()
+
+    def set_sort(self, key: str, descending: bool=False) -> None:
+        if key not in SortKey._all:
+            raise ValueError(f"wrong sort key={key}")
+
+        self.__sort_key = key
+        self.__sort_descending = descending
+
+    def set_limit(self, limit: int) -> None:
+        self.__limit = max(0, int(limit))
+
+
+def parse_query(text: str) -> VideoQuery:
+    """Return the query of a text, see the module documentation. Raise ValueError if a term is not valid."""
+
+    try:
+        terms = shlex.split(text)
+    except ValueError:
+        terms = text.split()  # An unfinished quote, while typing
+
+    query = VideoQuery()
+    words = []
+
+    for term in terms:
+
+        name, separator, value = term.partition(":")
+        if separator != "" and value != "":
+            match name.lower():
+                case "ext":
+                    for extension in value.split(","):
+                        query.add_extension(extension)
+                    continue
+
+                case "is" | "not":
+                    value = value.lower()
+                    if value in ProgressState._all and name.lower() == "is":
+                        query.set_progress_state(value)
+                    elif value in QueryFlag._all:
+                        query.set_flag(value, name.lower() == "is")
+                    else:
+                        raise ValueError(f"Invalid query term: {term}")
+                    continue
+
+                case "path":
+                    query.set_path(value)
+                    continue
+
+                case "sort":
+                    query.set_sort(value.lstrip("-").lower(), descending=value.startswith("-"))
+                    continue
+
+                case "limit":
+                    if not value.isdigit():
+                        raise ValueError(f"Invalid query term: {term}")
+                    query.set_limit(int(value))
+                    continue
+
+        range_match = __RANGE_TERM.match(term.lower())
+        if range_match is None:
+            words.append(term)
+            continue
+
+        attribute, operator, number, unit = range_match.groups()
+        if attribute not in QueryAttribute._all:
+            raise ValueError(f"Invalid query term: {term}")
+
+        units = __UNITS.get(attribute, {"": 1})
+        if unit not in units:
+            raise ValueError(f"Invalid unit in query term: {term}")
+
+        value = int(number) * units[unit]
+        match operator:
+            case ">=":
+                query.set_range(attribute, minimum=value)
+            case ">":
+                query.set_range(attribute, minimum=value + 1)
+            case "<=":
+                query.set_range(attribute, maximum=value)
+            case "<":
+                query.set_range(attribute, maximum=value - 1)
+            case "=":
+                query.set_range(attribute, minimum=value, maximum=value)
+
+    query.set_text(" ".join(words))
+
+    return query
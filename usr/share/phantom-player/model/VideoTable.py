@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+
+"""
+    Columnar encoding of the videos of a playlist snapshot (see controller/playlist_snapshot.py).
+
+    The hashes are stored as bytes and the numeric fields in typed arrays, so
+    a table of N videos is pickled and unpickled as a few objects instead of N
+    objects. It is read only: it is built from the videos and converted back to
+    Video objects when the snapshot is loaded. It is not the storage of the loaded
+    playlists, which keep Video objects because the interface holds references to
+    them, so it does not reduce their memory.
+"""
+
+from array import array
+from typing import Iterable, Iterator
+
+from model.Video import Video
+
+_HASH_BYTES = 32  # sha256
+
+
+class VideoTable(object):
+
+    def __init__(self, videos: Iterable[Video]=()) -> None:
+
+        self.__hashes = bytearray()
+        self.__text_hashes = {}  # index: hash, for the hashes that are not a lowercase sha256 hex digest
+        self.__directories = []
+        self.__directory_ids = array('I')
+        self.__file_names = []
+        self.__names = []
+        self.__durations = array('q')
+        self.__progresses = array('q')
+        self.__sizes = array('q')
+        self.__ratings = array('q')
+        self.__ignores = bytearray()
+
+        directory_ids = {}
+
+        for video in videos:
+            index = len(self.__file_names)
+            video_hash = video.get_hash()
+
+            try:
+                hash_bytes = bytes.fromhex(video_hash)
+            except ValueError:
+                hash_bytes = b""
+
+            if len(hash_bytes) != _HASH_BYTES or hash_bytes.hex() != video_hash:
+                self.__text_hashes[index] = video_hash
+                hash_bytes = bytes(_HASH_BYTES)
+
+            directory = video.get_directory()
+            directory_id = directory_ids.get(directory)
+            if directory_id is None:
+                directory_id = len(self.__directories)
+                directory_ids[directory] = directory_id
+                self.__directories.append(directory)
+
+            self.__hashes += hash_bytes
+            self.__directory_ids.append(directory_id)
+            self.__file_names.append(video.get_file_name())
+            self.__names.append(video.get_name())
+            self.__durations.append(video.get_duration())
+            self.__progresses.append(video.get_progress())
+            self.__sizes.append(video.get_size())
+            self.__ratings.append(video.get_rating())
+            self.__ignores.append(video.get_ignore())
+
+    def __len__(self) -> int:
+        return len(self.__file_names)
+
+    def get_hash(self, index: int) -> str:
+        video_hash = self.__text_hashes.get(index)
+        if video_hash is None:
+            video_hash = self.__hashes[index * _HASH_BYTES:(index + 1) * _HASH_BYTES].hex()
+
+        return video_hash
+
+    def get_path(self, index: int) -> str:
+        return self.__directories[self.__directory_ids[index]] + self.__file_names[index]
+
+    def get_name(self, index: int) -> str:
+        return self.__names[index]
+
+    def get_duration(self, index: int) -> int:
+        return self.__durations[index]
+
+    def get_progress(self, index: int) -> int:
+        return self.__progresses[index]
+
+    def get_size(self, index: int) -> int:
+        return self.__sizes[index]
+
+    def get_rating(self, index: int) -> int:
+        return self.__ratings[index]
+
+    def get_ignore(self, index: int) -> bool:
+        return self.__ignores[index] == 1
+
+    def get_video(self, index: int) -> Video:
+        video = Video(vhash=self.get_hash(index), path=self.get_path(index), name=self.__names[index])
+        video.set_duration(self.__durations[index])
+        video.set_progress(self.__progresses[index])
+        video.set_ignore(self.__ignores[index] == 1)
+        video.set_size(self.__sizes[index])
+        video.set_rating(self.__ratings[index])
+        return video
+
+    def get_videos(self) -> Iterator[Video]:
+        for index in range(len(self.__file_names)):
+            yield self.get_video(index)
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+
+from collections.abc import Sequence
+from typing import Callable, Iterator
+
+from model.Video import Video
+
+
+class VideosView(Sequence):
+    """
+        A read-only view of the videos of a playlist, returned by Playlist.get_videos() instead of a copy.
+
+        It covers the videos of the playlist when it was created: the videos added later are not part
+        of it. Once the videos are moved or removed, reading it raises RuntimeError (like a dictionary
+        changed during an iteration), the version is read from the playlist to detect it. Use snapshot()
+        to keep the videos while the playlist may change, for example from another thread.
+    """
+
+    __slots__ = ('__videos', '__length', '__get_version', '__version')
+
+    def __init__(self, videos: list[Video], get_version: Callable[[], int]) -> None:
+        self.__videos = videos
+        self.__length = len(videos)
+        self.__get_version = get_version
+        self.__version = get_version()
+
+    def __repr__(self) -> str:
+        return f"VideosView({self.__length} videos)"
+
+    def __len__(self) -> int:
+        self.__check_version()
+        return self.__length
+
+    def __getitem__(self, index: int | slice) -> Video | list[Video]:
+        self.__check_version()
+
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.__length)
+            if stop < 0:
+                stop = None  # The slice goes backwards until the first video included
+
+            return self.__videos[start:stop:step]
+
+        elif not -self.__length <= index < self.__length:
+            raise IndexError("video index out of range")
+
+        return self.__videos[index % self.__length]
+
+    def __iter__(self) -> Iterator[Video]:
+        self.__check_version()
+
+        get_version = self.__get_version
+        version = self.__version
+        videos = self.__videos
+
+        for index in range(self.__length):
+            if get_version() != version:
+                raise RuntimeError("The videos of the playlist changed during the iteration")
+
+            yield videos[index]
+
+    def __contains__(self, video: Video) -> bool:
+        try:
+            self.index(video)
+        except ValueError:
+            return False
+
+        return True
+
+    def index(self, video: Video, start: int=0, stop: int | None=None) -> int:
+        self.__check_version()
+        start, stop, _ = slice(start, stop).indices(self.__length)
+        return self.__videos.index(video, start, stop)
+
+    def snapshot(self) -> list[Video]:
+        """Return a copy of the videos, that is not affected by the next changes of the playlist."""
+        self.__check_version()
+        return self.__videos[:self.__length]
+
+    def __check_version(self) -> None:
+        if self.__get_version() != self.__version:
+            raise RuntimeError("The videos of the playlist changed, the view is no longer valid")
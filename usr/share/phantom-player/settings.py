@@ -28,6 +28,11 @@
 _IMAGE_FORMATS = ("jpeg", "jpg", "png", "webp", "svg")
 _VIDEO_HASH_SIZE = 64
 _SAVE_PLAYLISTS_SECONDS = 10 # Number of seconds that need to pass for saving a playlist
+_LOAD_PLAYLISTS_HEADERS_ONLY = True # At startup, load the videos only when a playlist is used
+_PLAYLIST_SNAPSHOTS = True # Keep a binary snapshot of the playlists to not parse them at every start
+_LOAD_PLAYLISTS_PROCESSES = True # Parse the playlist files in a process pool (instead of a thread pool)
+_PLAYLIST_COMPRESSION = None # None, "zlib" or "zstd" to compress the playlist files. They are read whatever the setting.
+_FILE_AVAILABILITY_SECONDS = 30 # Number of seconds that the listing of a directory (and the mount points) are cached
 
 class IconSize:
     class Small:
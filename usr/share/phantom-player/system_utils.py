@@ -83,6 +83,19 @@ def normalize_path(path:str) -> str:
 
     return path
 
+def split_path(path: str) -> list[str]:
+    """Return the components of a path, with any of the separators."""
+    return [component for component in path.replace("\\", "/").split("/") if component != ""]
+
+def is_path_within(path: str, parent: str) -> bool:
+    """
+        Return if path is parent or is inside of it. The whole components
+        are compared, so "/a/bc" is not within "/a/b".
+    """
+    path_components = split_path(path)
+    parent_components = split_path(parent)
+    return path_components[:len(parent_components)] == parent_components
+
 def has_non_empty_dirs(path: str) -> bool:
     """Check if a directory has non-empty subdirectories (only one level)."""
 
@@ -0,0 +1,198 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+"""
+    Benchmark of the playlist files (load & save).
+
+    Usage: python3 playlist_factory_benchmark.py [rows]
+"""
+
+import gc
+import os
+import sys
+import time
+import pickle
+import tempfile
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+import Paths
+from controller import playlist_factory
+from controller.playlist_factory import SaveParams
+from controller import playlist_compression
+from controller.playlist_compression import Compression
+from controller.playlist_migrations import _SCHEMA_VERSION
+from model.Playlist import Playlist, LoadStatus
+from model.PlaylistPath import PlaylistPath
+from model.Video import Video
+from model.VideoTable import VideoTable
+
+_DEFAULT_ROWS = 100_000
+_SAVE_ROWS = (10_000, 100_000, 500_000)
+
+
+def write_benchmark_file(file_path: str, rows: int) -> None:
+    with open(file_path, mode='w', encoding='utf-8') as f:
+        f.write(f"{SaveParams.Section._schema}\n\nversion={_SCHEMA_VERSION}\n\n")
+        f.write(f"{SaveParams.Section._settings}\n\n")
+        f.write("hidden=False\nrandom=False\nkeep_playing=True\nstart_at=0\n")
+        f.write(f"\n{SaveParams.Section._sources}\n\n")
+        f.write("/media/benchmark|recursive=True|startup_discover=False\n")
+        f.write(f"\n{SaveParams.Section._summary}\n\npercent=0\nvideos={rows}\n")
+        f.write(f"\n{SaveParams.Section._videos}\n\n")
+        for i in range(rows):
+            # The paths do not exist, so the videos are not probed.
+            f.write(f"{i:064x}|duration=1500|progress=0|ignore=False"
+                    f"|path=/media/benchmark/season {i // 100}/episode {i}.mkv"
+                    f"|name=episode {i}|size=734003200|rating=0\n")
+
+
+def benchmark_load(rows: int) -> None:
+    playlist_factory._PLAYLIST_SNAPSHOTS = False
+
+    with tempfile.TemporaryDirectory() as dir_path:
+        Paths._SERIES_DIR = dir_path
+        playlist_factory._SERIES_DIR = dir_path
+
+        file_path = os.path.join(dir_path, "benchmark.cfg")
+        write_benchmark_file(file_path, rows)
+
+        start = time.perf_counter()
+        playlist = playlist_factory.load(file_path)
+        elapsed = time.perf_counter() - start
+
+    print(f"load: {rows} rows in {elapsed:.3f}s ({elapsed / rows * 1e6:.2f}us/row)")
+    assert len(playlist.get_videos()) == rows
+
+
+def create_benchmark_playlist(rows: int) -> Playlist:
+    playlist = Playlist()
+    playlist.set_name("benchmark")
+    playlist.set_load_status(LoadStatus._loaded)
+    playlist.add_playlist_path(PlaylistPath("/media/benchmark", recursive=True, startup_discover=False))
+
+    for i in range(rows):
+        video = Video(vhash=f"{i:064x}", path=f"/media/benchmark/season {i // 100}/episode {i}.mkv")
+        video.set_duration(1500)
+        video.set_size(734003200)
+        playlist.add_video(video)
+
+    return playlist
+
+
+def benchmark_save(rows: int) -> None:
+    playlist = create_benchmark_playlist(rows)
+
+    with tempfile.TemporaryDirectory() as dir_path:
+        Paths._SERIES_DIR = dir_path
+        playlist_factory._SERIES_DIR = dir_path
+
+        start = time.perf_counter()
+        playlist_factory.save(playlist)
+        elapsed = time.perf_counter() - start
+
+        # Measured separately, because tracemalloc slows down the execution
+        tracemalloc.start()
+        playlist_factory.save(playlist)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"save: {rows} rows in {elapsed:.3f}s, peak memory {peak / 1024 / 1024:.1f} MiB")
+
+
+def benchmark_compression(rows: int) -> None:
+    playlist_factory._PLAYLIST_SNAPSHOTS = False
+    playlist = create_benchmark_playlist(rows)
+
+    with tempfile.TemporaryDirectory() as dir_path:
+        Paths._SERIES_DIR = dir_path
+        playlist_factory._SERIES_DIR = dir_path
+
+        for compression in (Compression._none, Compression._zlib, Compression._zstd):
+            if compression == Compression._zstd and playlist_compression.zstandard is None:
+                print("compression=zstd: skipped, the zstandard module is not installed (zlib would be used)")
+                continue
+
+            playlist_factory._PLAYLIST_COMPRESSION = compression
+
+            start = time.perf_counter()
+            playlist_factory.save(playlist)
+            save_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            loaded_playlist = playlist_factory.load(playlist.get_save_path())
+            load_elapsed = time.perf_counter() - start
+
+            file_size = os.path.getsize(playlist.get_save_path())
+            print(f"compression={compression}: {rows} rows, {file_size / 1024 / 1024:.1f} MiB, "
+                  f"save {save_elapsed:.3f}s, load {load_elapsed:.3f}s")
+            assert len(loaded_playlist.get_videos()) == rows
+
+    playlist_factory._PLAYLIST_COMPRESSION = Compression._none
+
+
+def benchmark_memory(rows: int) -> None:
+    """Compare the memory of a loaded playlist with the one of its snapshot encoding (VideoTable)."""
+    playlist_factory._PLAYLIST_SNAPSHOTS = False
+
+    with tempfile.TemporaryDirectory() as dir_path:
+        Paths._SERIES_DIR = dir_path
+        playlist_factory._SERIES_DIR = dir_path
+
+        file_path = os.path.join(dir_path, "benchmark.cfg")
+        write_benchmark_file(file_path, rows)
+
+        gc.collect()
+        tracemalloc.start()
+        playlist = playlist_factory.load(file_path)
+        gc.collect()
+        playlist_memory, _ = tracemalloc.get_traced_memory()
+
+        table = VideoTable(playlist.get_videos())
+        del playlist
+        gc.collect()
+        table_memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    table_size = len(pickle.dumps(table, protocol=pickle.HIGHEST_PROTOCOL))
+
+    print(f"memory: {playlist_memory / rows:.0f} bytes/video in a playlist, "
+          f"{table_memory / rows:.0f} bytes/video in a snapshot table, {table_size / rows:.0f} bytes/video pickled")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        benchmark_load(int(sys.argv[1]))
+        benchmark_save(int(sys.argv[1]))
+        benchmark_compression(int(sys.argv[1]))
+        benchmark_memory(int(sys.argv[1]))
+    else:
+        benchmark_load(_DEFAULT_ROWS)
+        for save_rows in _SAVE_ROWS:
+            benchmark_save(save_rows)
+        benchmark_compression(_DEFAULT_ROWS)
+        benchmark_memory(_DEFAULT_ROWS)
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+
+#
+#   This file is part of Phantom Player.
+#
+# Copyright (c) 2026 Rafael Senties Martinelli.
+#
+# This file is free software: you can redistribute it and/or modify
+# it under the terms of either:
+#
+#   - the GNU Lesser General Public License as published by
+#     the Free Software Foundation, version 2.1 only, or
+#
+#   - the GNU General Public License as published by
+#     the Free Software Foundation, version 3 only.
+#
+# This file is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty
+# of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the applicable licenses for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# version 2.1 and the GNU General Public License version 3
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# SPDX-License-Identifier: LGPL-2.1-only OR GPL-3.0-only
+
+from threading import Lock
+from typing import Callable
+from gi.repository import GLib
+
+from model.Events import ModelEvent, coalesce_events
+
+
+class EventDispatcher(object):
+    """
+        Collect the model events from any thread, and deliver them in batches to the GTK main loop.
+
+        A single idle callback is scheduled for all the events received until it runs, so
+        a discovery that adds thousands of videos updates the GUI a few times instead of
+        once per video. The repeated changes of a field are merged, see coalesce_events().
+    """
+
+    def __init__(self, func: Callable[[list[ModelEvent]], None]) -> None:
+        self.__func = func
+        self.__lock = Lock()
+        self.__events = []
+        self.__scheduled = False
+
+    def push(self, event: ModelEvent) -> None:
+        """Can be called from a thread."""
+
+        with self.__lock:
+            self.__events.append(event)
+            if self.__scheduled:
+                return
+
+            self.__scheduled = True
+
+        GLib.idle_add(self.__dispatch)
+
+    def __dispatch(self) -> bool:
+
+        with self.__lock:
+            events = self.__events
+            self.__events = []
+            self.__scheduled = False
+
+        self.__func(coalesce_events(events))
+
+        return False  # Do not call it again
@@ -64,14 +64,22 @@ from view import gtk_utils
 from Paths import _SERIES_DIR, _CONF_FILE
 from console_printer import print_debug
 import system_utils
+import file_availability
 from system_utils import EventCodes, open_directory
 from CCParser import CCParser
 from controller import video_factory
 from controller import playlist_factory
+from controller import playlist_snapshot
+from controller.metadata_backfill import MetadataBackfill
 from model.Playlist import Playlist
 from model.Playlist import _SAVE_EXTENSION as _PLAYLIST_EXTENSION
 from model.Playlist import LoadStatus as PlaylistLoadStatus
 from model.CurrentMedia import CurrentMedia
+from model.Library import Library
+from model.Video import Video
+from model.Events import EventKind
+from model.VideoQuery import parse_query
+from view.EventDispatcher import EventDispatcher
 from view.SettingsWindow import SettingsWindow
 from view.DialogRenameSingle import DialogRenameSingle
 from view.GtkPlayer import GtkPlayer, CustomSignals
@@ -100,6 +108,7 @@ class VideosListstoreColumnsIndex:
     _duration = 7
     _rating = 8
     _size = 9
+    _name_key = 10  # Hidden, the natural key used to sort the names
 
 
 class GUIView:
@@ -143,8 +152,11 @@ class PhantomPlayer:
         self.__application = application
         self.__playlist_new = None
         self.__playlists = {}
+        self.__library = Library()
+        self.__model_events = EventDispatcher(self.__on_model_events)  # The events of all the playlists
         self.__current_playlist_loaded = False
         self.__playlist_headers_are_loaded = False
+        self.__thread_search_load = None  # Loads the videos that a search with criteria needs
 
         self.__current_media = CurrentMedia()
         self.__selected_videos = []
@@ -217,6 +229,7 @@ class PhantomPlayer:
         self.__column_size = builder.get_object('column_size')
         self.__liststore_playlists = builder.get_object('liststore_playlists')
         self.__liststore_videos = builder.get_object('liststore_videos')
+        self.__liststore_videos_hashes = set()  # The hashes of the rows, a video can be added by populate and by an event
         self.__box_window = builder.get_object('box_window')
         self.__paned = None
 
@@ -228,6 +241,8 @@ class PhantomPlayer:
         self.__menuitem_videos_rename = builder.get_object('menuitem_videos_rename')
         self.__menuitem_videos_move_up = builder.get_object('menuitem_videos_move_up')
         self.__menuitem_videos_move_down = builder.get_object('menuitem_videos_move_down')
+        self.__menuitem_videos_move_top = builder.get_object('menuitem_videos_move_top')
+        self.__menuitem_videos_move_bottom = builder.get_object('menuitem_videos_move_bottom')
         self.__menuitem_videos_open = builder.get_object('menuitem_videos_open')
         self.__menuitem_videos_delete = builder.get_object('menuitem_videos_delete')
 
@@ -314,6 +329,8 @@ class PhantomPlayer:
         self.__menuitem_videos_rename.connect('activate', self.__on_menuitem_videos_rename_single)
         self.__menuitem_videos_move_up.connect('activate', self.__on_menuitem_videos_move, True)
         self.__menuitem_videos_move_down.connect('activate', self.__on_menuitem_videos_move, False)
+        self.__menuitem_videos_move_top.connect('activate', self.__on_menuitem_videos_move_to, True)
+        self.__menuitem_videos_move_bottom.connect('activate', self.__on_menuitem_videos_move_to, False)
         self.__menuitem_videos_open.connect('activate', self.__on_menuitem_videos_open)
         self.__menuitem_videos_delete.connect('activate', self.__on_menuitem_videos_delete)
 
@@ -412,14 +429,13 @@ class PhantomPlayer:
 
         self.__window_playlist_settings = SettingsWindow(parent=self.__window_root,
                                                          playlists=self.__playlists,
+                                                         library=self.__library,
                                                          add_playlist_func=self.__on_window_psettings_playlist_add,
                                                          delete_playlist_func=self.__on_window_psettings_playlist_delete,
                                                          restart_playlist_func=self.__on_window_psettings_playlist_restart,
                                                          close_playlist_func=self.__on_window_psettings_playlist_close,
                                                          change_playlist_func=self.__on_window_psettings_playlist_change,
-                                                         add_video_glib_func=self.__liststore_videos_add_glib,
-                                                         update_video_glib_func=self.__liststore_videos_update_glib,
-                                                         remove_video_glib_func=self.__liststore_videos_remove_glib,
+                                                         remove_videos_glib_func=self.__liststore_videos_remove_glib,
                                                          reload_all_videos_func=self.__liststore_videos_populate)
 
         for checkbox, config_tag in ((self.__checkbox_dark_theme, GlobalConfigTags._dark_theme),
@@ -479,9 +495,18 @@ class PhantomPlayer:
         #
         #    Load the existent playlist
         #
+        # The rows of the updated videos are refreshed by the model events
+        self.__metadata_backfill = MetadataBackfill(done_func=self.__on_metadata_backfill_done, idle_func=GLib.idle_add)
+
         self.__thread_load_playlists = Thread(target=self.__on_thread_playlists_load)
         self.__thread_load_playlists.start()
 
+        #
+        #    Refresh the videos when their files become (un)available
+        #
+        file_availability.connect(self.__on_file_availability_changed)
+        GLib.timeout_add_seconds(settings._FILE_AVAILABILITY_SECONDS, self.__on_file_availability_timeout)
+
     def present(self):
         self.__window_root.present()
 
@@ -502,11 +527,19 @@ class PhantomPlayer:
         #
         # Play the video from a playlist (if it exists)
         #
-        for playlist in self.__playlists.values():
-            video = playlist.get_video_by_path(file_path)
-            if video is not None:
-                self.__playlist_open(playlist, video)
-                return True
+        playlist, video = self.__library.get_video_by_path(file_path)
+
+        if video is None:
+            # The videos that are not loaded yet are not indexed. Once loaded, they will be.
+            for playlist in self.__playlists.values():
+                playlist_factory.load_videos(playlist)
+                video = playlist.get_video_by_path(file_path)
+                if video is not None:
+                    break
+
+        if video is not None:
+            self.__playlist_open(playlist, video)
+            return True
 
         #
         # Play the video without a playlist
@@ -531,6 +564,7 @@ class PhantomPlayer:
         # It is better to stop the playlists threads before quitting the media player,
         # because the VLC instance will be released.
         self.__thread_load_playlists.join()
+        self.__metadata_backfill.quit()
         vlc_utils.release_instance()
         self.__mp_widget.quit()
         self.__application.quit()
@@ -719,6 +753,9 @@ class PhantomPlayer:
                                                                 on_error=settings.FontColors._error)
 
     def __playlist_open(self, playlist, video=None):
+        file_availability.invalidate()  # To display the current state of the files
+        playlist_factory.load_videos(playlist)
+        self.__metadata_backfill.add_playlist(playlist)
         self.__current_media = CurrentMedia(playlist)
         self.__set_view(playlists_menu=False)
         self.__liststore_videos_populate()
@@ -794,16 +831,27 @@ class PhantomPlayer:
         """
             I do not understand why this must be a separate method.
             It is not possible to call directly: GLib.idle_add(self.__liststore_playlists.append, data)
+
+            The playlists may be loaded in any order, so the row is inserted sorted by name.
         """
         pixbuf = Pixbuf.new_from_file_at_size(playlist.get_icon_path(),
                                               self.__icons_size[0],
                                               self.__icons_size[1])
 
-        self.__liststore_playlists.append([playlist.get_guid(),
-                                           pixbuf,
-                                           self.__fontcolor_default,
-                                           playlist.get_name(),
-                                           playlist.get_percent()])
+        data = [playlist.get_guid(),
+                pixbuf,
+                self.__fontcolor_default,
+                playlist.get_name(),
+                playlist.get_percent()]
+
+        # Search from the end, because most of the times the playlists are added in order.
+        name = playlist.get_name()
+        for index in range(len(self.__liststore_playlists) - 1, -1, -1):
+            if self.__liststore_playlists[index][PlaylistListstoreColumnsIndex._name] <= name:
+                self.__liststore_playlists.insert(index + 1, data)
+                return
+
+        self.__liststore_playlists.insert(0, data)
 
     def __liststore_playlists_populate(self):
 
@@ -811,8 +859,22 @@ class PhantomPlayer:
         # Filter
         #
         text_filter = self.__entry_playlist_search.get_text().lower().strip()
+        try:
+            query = parse_query(text_filter)
+        except ValueError:
+            query = None  # Probably being typed
+
         if text_filter == "":
             filtered_playlists = self.__playlists.values()
+
+        elif query is not None and query.has_criteria():
+            # Only the playlists with videos that match the query (e.g.: "rating>=4 is:unwatched").
+            # The videos that are not loaded yet are not indexed: until a thread loads them,
+            # the results are partial and the progress is displayed in the search entry.
+            self.__search_load_videos()
+            playlists_guid = {playlist.get_guid() for playlist, _ in self.__library.query(query)}
+            filtered_playlists = [playlist for playlist in self.__playlists.values()
+                                  if playlist.get_guid() in playlists_guid]
         else:
             filtered_playlists = []
             for playlist in self.__playlists.values():
@@ -827,6 +889,33 @@ class PhantomPlayer:
             if self.__playlist_should_be_listed(playlist):
                 self.__liststore_playlists_append(playlist)
 
+    def __search_load_videos(self):
+        if self.__thread_search_load is not None and self.__thread_search_load.is_alive():
+            return
+
+        playlists = [playlist for playlist in self.__playlists.values() if not playlist.get_videos_loaded()]
+        if len(playlists) == 0:
+            return
+
+        self.__entry_playlist_search.set_progress_fraction(0.01)
+        self.__thread_search_load = Thread(target=self.__on_thread_search_load, args=[playlists], daemon=True)
+        self.__thread_search_load.start()
+
+    def __on_thread_search_load(self, playlists):
+
+        for i, playlist in enumerate(playlists, start=1):
+            if self.__quit_requested:
+                return
+
+            playlist_factory.load_videos(playlist)
+            GLib.idle_add(self.__entry_playlist_search.set_progress_fraction, i / len(playlists))
+
+        GLib.idle_add(self.__on_search_videos_loaded)
+
+    def __on_search_videos_loaded(self):
+        self.__entry_playlist_search.set_progress_fraction(0)
+        self.__liststore_playlists_populate()  # With all the results
+
     def __treeview_videos_search_func(self, model, _column, key, row_iter):
 
         if key.lower() in model[row_iter][VideosListstoreColumnsIndex._name].lower():
@@ -837,6 +926,7 @@ class PhantomPlayer:
     def __liststore_videos_populate(self, *_):
 
         self.__liststore_videos.clear()
+        self.__liststore_videos_hashes.clear()
         self.__column_name.set_spacing(0)
 
         if self.__current_media._playlist is None:
@@ -847,19 +937,30 @@ class PhantomPlayer:
                 self.__liststore_videos_add(video)
 
     def __liststore_videos_add(self, video):
-        if not video.get_ignore() or self.__checkbox_video_rhidden.get_active():
+        """
+            The videos loaded before populating the liststore also emit an added event,
+            which is handled afterward, so the videos already listed are skipped.
+        """
+
+        if video.get_hash() in self.__liststore_videos_hashes:
+            return
+
+        elif not video.get_ignore() or self.__checkbox_video_rhidden.get_active():
+            self.__liststore_videos_hashes.add(video.get_hash())
             self.__liststore_videos.append([video.get_hash(),
                                             self.__get_video_color(video),
-                                            video.get_number(),
+                                            self.__current_media._playlist.get_video_number(video),
                                             video.get_path(),
                                             video.get_name(),
                                             video.get_extension(),
                                             video.get_percent(),
                                             video.get_duration(),
                                             video.get_rating(),
-                                            video.get_size()])
+                                            video.get_size(),
+                                            video.get_sort_key()])
 
-    def __liststore_videos_refresh(self):
+    def __liststore_videos_refresh(self, first=0, last=None):
+        """Refresh the rows of the videos from the index first to last (included) of the playlist."""
 
         if self.__current_media._playlist is None:
             return
@@ -867,7 +968,10 @@ class PhantomPlayer:
         hidden_videos = self.__checkbox_video_rhidden.get_active()
         max_nb = len(self.__liststore_videos)
         index = -1
-        for video in self.__current_media._playlist.get_videos():
+        for video_index, video in enumerate(self.__current_media._playlist.get_videos()):
+
+            if last is not None and video_index > last:
+                return
 
             if video.get_ignore() and not hidden_videos:
                 continue
@@ -876,11 +980,15 @@ class PhantomPlayer:
             if index >= max_nb:
                 return
 
+            elif video_index < first:
+                continue
+
             self.__liststore_videos[index][VideosListstoreColumnsIndex._hash] = video.get_hash()
             self.__liststore_videos[index][VideosListstoreColumnsIndex._color] = self.__get_video_color(video)
-            self.__liststore_videos[index][VideosListstoreColumnsIndex._nb] = video.get_number()
+            self.__liststore_videos[index][VideosListstoreColumnsIndex._nb] = video_index + 1
             self.__liststore_videos[index][VideosListstoreColumnsIndex._path] = video.get_path()
             self.__liststore_videos[index][VideosListstoreColumnsIndex._name] = video.get_name()
+            self.__liststore_videos[index][VideosListstoreColumnsIndex._name_key] = video.get_sort_key()
             self.__liststore_videos[index][VideosListstoreColumnsIndex._ext] = video.get_extension()
             self.__liststore_videos[index][VideosListstoreColumnsIndex._duration] = video.get_duration()
             self.__liststore_videos[index][VideosListstoreColumnsIndex._size] = video.get_size()
@@ -896,7 +1004,6 @@ class PhantomPlayer:
                                   duration=True,
                                   size=True):
         # Warning:
-        #   + If the args order is changed, __liststore_videos_update_glib must be updated.
         #   + If an additional arg is added, check for the functions that already use it.
 
         if video is None:
@@ -909,11 +1016,12 @@ class PhantomPlayer:
                     self.__liststore_videos[i][VideosListstoreColumnsIndex._color] = self.__get_video_color(video)
 
                 if number:
-                    self.__liststore_videos[i][VideosListstoreColumnsIndex._nb] = video.get_number()
+                    self.__liststore_videos[i][VideosListstoreColumnsIndex._nb] = self.__current_media._playlist.get_video_number(video)
 
                 if path:
                     self.__liststore_videos[i][VideosListstoreColumnsIndex._path] = video.get_path()
                     self.__liststore_videos[i][VideosListstoreColumnsIndex._name] = video.get_name()
+                    self.__liststore_videos[i][VideosListstoreColumnsIndex._name_key] = video.get_sort_key()
 
                 if duration:
                     self.__liststore_videos[i][VideosListstoreColumnsIndex._duration] = video.get_duration()
@@ -926,63 +1034,161 @@ class PhantomPlayer:
 
                 return
 
+    def __liststore_videos_update_colors(self, directory):
+        """Update the color of the videos of a directory and of its sub-directories."""
+
+        playlist = self.__current_media._playlist
+        if playlist is None:
+            return
+
+        videos_hash = {video.get_hash() for video in playlist.get_videos_by_directory(directory)}
+        if len(videos_hash) == 0:
+            return
+
+        for row in self.__liststore_videos:
+            if row[VideosListstoreColumnsIndex._hash] in videos_hash:
+                video = playlist.get_video_by_hash(row[VideosListstoreColumnsIndex._hash])
+                row[VideosListstoreColumnsIndex._color] = self.__get_video_color(video)
+
     def __liststore_videos_select(self, videos):
         self.__treeselection_videos.unselect_all()
-        for video in videos:
-            video_hash = video.get_hash()
-            for row in self.__liststore_videos:
-                if row[VideosListstoreColumnsIndex._hash] == video_hash:
-                    self.__treeselection_videos.select_iter(row.iter)
-                    break
 
-    def __liststore_videos_remove(self, video):
-        video_hash = video.get_hash()
+        videos_hash = {video.get_hash() for video in videos}
         for row in self.__liststore_videos:
-            if row[VideosListstoreColumnsIndex._hash] == video_hash:
-                self.__liststore_videos.remove(row.iter)
-                break
+            if row[VideosListstoreColumnsIndex._hash] in videos_hash:
+                self.__treeselection_videos.select_iter(row.iter)
 
-    def __liststore_videos_add_glib(self, playlist, video):
-        """To be called from a thread"""
+    def __liststore_videos_remove(self, videos):
 
-        if not self.__current_media.is_playlist(playlist):
-            return
+        videos_hash = {video.get_hash() for video in videos}
+        self.__liststore_videos_hashes.difference_update(videos_hash)
+        row_iters = [row.iter for row in self.__liststore_videos
+                     if row[VideosListstoreColumnsIndex._hash] in videos_hash]
 
-        GLib.idle_add(self.__liststore_videos_add, video)
-
-    def __liststore_videos_update_glib(self,
-                                       playlist,
-                                       video,
-                                       number=True,
-                                       progress=True,
-                                       color=True,
-                                       path=True,
-                                       duration=True,
-                                       size=True):
-        """To be called from a thread"""
+        # The iters of a ListStore remain valid after removing other rows
+        for row_iter in row_iters:
+            self.__liststore_videos.remove(row_iter)
 
-        if not self.__current_media.is_playlist(playlist):
-            return
+    def __liststore_videos_renumber(self, first):
+        """Update the number of the rows, after removing videos from the index first of the playlist."""
 
-        GLib.idle_add(self.__liststore_videos_update,
-                      video,
-                      number,
-                      progress,
-                      color,
-                      path,
-                      duration,
-                      size)
+        playlist = self.__current_media._playlist
+        for row in self.__liststore_videos:
+            # The rows before the first removed video keep their number
+            if row[VideosListstoreColumnsIndex._nb] > first:
+                video = playlist.get_video_by_hash(row[VideosListstoreColumnsIndex._hash])
+                if video is not None:
+                    row[VideosListstoreColumnsIndex._nb] = playlist.get_video_number(video)
 
-    def __liststore_videos_remove_glib(self, playlist, video):
-        """To be called from a thread"""
+    def __liststore_videos_update_fields(self, changed_fields):
+        """Update, in a single pass, only the columns of the changed fields of each video (video: fields)."""
 
-        if not self.__current_media.is_playlist(playlist):
-            return
+        changed_rows = {video.get_hash(): (video, fields) for video, fields in changed_fields.items()}
 
-        elif self.__current_media.get_video_hash() == video.get_hash():
+        for row in self.__liststore_videos:
+            try:
+                video, fields = changed_rows[row[VideosListstoreColumnsIndex._hash]]
+            except KeyError:
+                continue
+
+            if 'path' in fields:
+                row[VideosListstoreColumnsIndex._path] = video.get_path()
+                row[VideosListstoreColumnsIndex._name] = video.get_name()
+                row[VideosListstoreColumnsIndex._name_key] = video.get_sort_key()
+                row[VideosListstoreColumnsIndex._ext] = video.get_extension()
+
+            if 'path' in fields or 'ignore' in fields:
+                row[VideosListstoreColumnsIndex._color] = self.__get_video_color(video)
+
+            if 'duration' in fields:
+                row[VideosListstoreColumnsIndex._duration] = video.get_duration()
+
+            if 'progress' in fields or 'duration' in fields:
+                row[VideosListstoreColumnsIndex._progress] = video.get_percent()
+
+            if 'size' in fields:
+                row[VideosListstoreColumnsIndex._size] = video.get_size()
+
+            if 'rating' in fields:
+                row[VideosListstoreColumnsIndex._rating] = video.get_rating()
+
+    def __liststore_videos_remove_glib(self, playlist, videos):
+        """To be called from a thread, the rows are removed by the model events"""
+
+        if self.__current_media.is_playlist(playlist) and \
+                self.__current_media.get_video_hash() in {video.get_hash() for video in videos}:
             self.__mp_widget.stop()
 
-        GLib.idle_add(self.__liststore_videos_remove, video)
+    def __on_model_events(self, events):
+        """
+            Update only the rows that changed. It is called by the GTK main loop,
+            with the coalesced events of all the playlists (see EventDispatcher).
+        """
+
+        added_videos = []
+        removed_videos = []
+        first_removed = None
+        moved_range = None
+        changed_fields = {}  # Video: fields
+        progress_playlists = {}  # Guid: playlist, whose progress changed
+
+        for event in events:
+            playlist = event.get_source()
+            video = event.get_target()
+
+            if event.get_kind() == EventKind._moved:
+                if self.__current_media.is_playlist(playlist):
+                    first, last = event.get_old_value()
+                    if moved_range is not None:
+                        first, last = min(first, moved_range[0]), max(last, moved_range[1])
+                    moved_range = first, last
+                continue
+
+            elif not isinstance(video, Video):
+                continue  # The changes of the playlists and of their paths are displayed by the settings window
+
+            elif event.get_field() in ('progress', 'duration', 'ignore') or \
+                    event.get_kind() in (EventKind._added, EventKind._removed):
+                progress_playlists[playlist.get_guid()] = playlist
+
+            if not self.__current_media.is_playlist(playlist):
+                continue
+
+            match event.get_kind():
+                case EventKind._added:
+                    added_videos.append(video)
+
+                case EventKind._removed:
+                    removed_videos.append(video)
+                    index = event.get_old_value()
+                    first_removed = index if first_removed is None else min(first_removed, index)
+
+                case EventKind._changed:
+                    changed_fields.setdefault(video, set()).add(event.get_field())
+
+        if len(removed_videos) > 0:
+            self.__liststore_videos_remove(removed_videos)
+            self.__liststore_videos_renumber(first_removed)
+
+        for video in added_videos:
+            self.__liststore_videos_add(video)
+
+        if moved_range is not None:
+            self.__liststore_videos_refresh(*moved_range)
+
+        if len(changed_fields) > 0:
+            self.__liststore_videos_update_fields(changed_fields)
+
+        for playlist in progress_playlists.values():
+            self.__liststore_playlists_update_progress(playlist)
+
+    def __on_file_availability_changed(self, directory):
+        """Can be called from a thread"""
+        GLib.idle_add(self.__liststore_videos_update_colors, directory)
+
+    def __on_file_availability_timeout(self):
+        file_availability.check_mounts()
+        return not self.__quit_requested  # False removes the timeout
 
     def __on_thread_playlists_load(self):
 
@@ -994,29 +1200,32 @@ class PhantomPlayer:
         # Load the playlist's files
         #
         if os.path.exists(_SERIES_DIR):
-            for file_name in sorted(os.listdir(_SERIES_DIR)):
-
-                if self.get_quit():
-                    killed = True
-                    break
+            file_paths = [system_utils.join_path(_SERIES_DIR, file_name)
+                          for file_name in sorted(os.listdir(_SERIES_DIR))
+                          if file_name.lower().endswith(_PLAYLIST_EXTENSION)]
 
-                elif not file_name.lower().endswith(_PLAYLIST_EXTENSION):
-                    continue
+            # The playlists are displayed as soon as they are loaded, their guid is
+            # the position of their file, so it doesn't depend on the loading order.
+            for guid, playlist in playlist_factory.load_all(file_paths,
+                                                            headers_only=settings._LOAD_PLAYLISTS_HEADERS_ONLY,
+                                                            quit_func=self.get_quit):
 
-                full_path = system_utils.join_path(_SERIES_DIR, file_name)
-
-                playlist = playlist_factory.load(file_path=full_path)
-                playlist.set_guid(len(self.__playlists))
+                playlist.set_guid(guid)
                 playlist.set_load_status(PlaylistLoadStatus._loading)
 
                 if playlist.get_name() == current_playlist_name:
                     current_playlist = playlist
 
                 self.__playlists[playlist.get_guid()] = playlist
+                self.__library.add_playlist(playlist)
+                playlist.connect(self.__model_events.push)
 
                 if self.__playlist_should_be_listed(playlist):
                     GLib.idle_add(self.__liststore_playlists_append, playlist)
 
+            if self.get_quit():
+                killed = True
+
         #
         # Once the playlist's files are loaded, it is possible to create new playlists.
         #
@@ -1026,7 +1235,7 @@ class PhantomPlayer:
         #
         #    Discover new videos of the playlists (starting by the saved playlist)
         #
-        playlists = list(self.__playlists.values())
+        playlists = [self.__playlists[guid] for guid in sorted(self.__playlists)]
         if current_playlist is not None:
             playlists.remove(current_playlist)
             playlists.insert(0, current_playlist)
@@ -1045,13 +1254,16 @@ class PhantomPlayer:
             # there is a different trigger.
 
             if playlist.requires_discover(is_startup=True):
+                playlist_factory.load_videos(playlist)
                 video_factory.discover(playlist,
-                                       add_func=self.__liststore_videos_add_glib,
-                                       update_func=self.__liststore_videos_update_glib,
-                                       quit_func=self.get_quit)
+                                       quit_func=self.get_quit,
+                                       library=self.__library)
 
             playlist.set_load_status(PlaylistLoadStatus._loaded)
 
+            if playlist.get_videos_loaded():
+                self.__metadata_backfill.add_playlist(playlist)
+
             GLib.idle_add(self.__liststore_playlists_update_progress, playlist)
 
             if self.__current_media.is_playlist(playlist):
@@ -1069,6 +1281,11 @@ class PhantomPlayer:
         else:
             print_debug("Load playlist ended.")
 
+    def __on_metadata_backfill_done(self, playlist):
+        """To be called from a thread"""
+        GLib.idle_add(playlist_factory.save, playlist)
+        GLib.idle_add(self.__liststore_playlists_update_progress, playlist)
+
     def __on_cellrenderer_rating_changed(self, liststore, treepath, rating):
         video_hash = liststore[treepath][VideosListstoreColumnsIndex._hash]
         video = self.__current_media.get_video_by_hash(video_hash)
@@ -1101,19 +1318,10 @@ class PhantomPlayer:
         #   + Make direct calls to the GUI, use GLib.
         #
 
+        # The row of the video is updated by the model event of the progress
         should_save = self.__current_media.set_video_progress(time)
 
-        self.__liststore_videos_update_glib(self.__current_media._playlist,
-                                            self.__current_media._video,
-                                            number=False,
-                                            progress=True,
-                                            color=False,
-                                            path=False,
-                                            duration=False,
-                                            size=False)
-
         #
-        # > I set the GUI call before saving the playlist to "maybe" reduce GUI Lag.
         # > Saving the playlist here, allows to save the progress if the software crashes, or
         #   if suddenly it is stopped (no power, process killed, etc...). So doing it every second
         #   seems like a waste of resources.
@@ -1140,15 +1348,6 @@ class PhantomPlayer:
         self.__current_media.end_video_progress()
         playlist_factory.save(self.__current_media._playlist)  # Important in case of a crash
 
-        self.__liststore_videos_update_glib(self.__current_media._playlist,
-                                            self.__current_media._video,
-                                            number=False,
-                                            progress=True,
-                                            color=False,
-                                            path=False,
-                                            duration=False,
-                                            size=False)
-
         if self.__current_media._playlist.get_keep_playing():
             GLib.idle_add(self.__set_video, None, was_playing)
         else:
@@ -1209,6 +1408,8 @@ class PhantomPlayer:
     def __on_window_psettings_playlist_add(self, playlist):
 
         self.__playlists[playlist.get_guid()] = playlist
+        self.__library.add_playlist(playlist)
+        playlist.connect(self.__model_events.push)
 
         if self.__playlist_should_be_listed(playlist):
             self.__liststore_playlists_append(playlist)
@@ -1234,6 +1435,8 @@ class PhantomPlayer:
     def __on_window_psettings_playlist_delete(self, playlist):
 
         self.__playlists.pop(playlist.get_guid())
+        self.__library.remove_playlist(playlist)
+        playlist.disconnect(self.__model_events.push)
 
         # Remove from the player (if necessary)
         if self.__current_media.is_playlist(playlist):
@@ -1248,6 +1451,8 @@ class PhantomPlayer:
         if os.path.exists(playlist.get_save_path()):
             os.remove(playlist.get_save_path())
 
+        playlist_snapshot.remove(playlist.get_save_path())
+
         # remove the item from the playlist store
         for row in self.__liststore_playlists:
             if row[PlaylistListstoreColumnsIndex._id] == playlist.get_guid():
@@ -1272,7 +1477,7 @@ class PhantomPlayer:
 
     def __on_menuitem_new_playlist_activate(self, *_):
         new_playlist = Playlist()
-        new_playlist.set_guid(len(self.__playlists))
+        new_playlist.set_guid(max(self.__playlists, default=-1) + 1)
         new_playlist.set_load_status(PlaylistLoadStatus._loaded)
         self.__window_playlist_settings.show(playlist=new_playlist,
                                              is_new=True,
@@ -1501,14 +1706,12 @@ class PhantomPlayer:
             if video.get_hash() == hash_to_skip:
                 continue
 
+            # The rows and the playlist progress are updated by the model events
             if start:
                 video.set_progress(0)
             else:
                 video.end_progress()
 
-            self.__liststore_videos_update(video, color=False, path=False, duration=False)
-
-        self.__liststore_playlists_update_progress(self.__current_media._playlist)
         playlist_factory.save(self.__current_media._playlist)  # Important in case of a crash
         self.__on_treeselection_videos_changed()  # To reload the shortcuts
 
@@ -1522,8 +1725,9 @@ class PhantomPlayer:
             video.set_ignore(ignore)
             if row_hidden:
                 self.__liststore_videos_update(video, progress=False, path=False, duration=False)
-            elif ignore:
-                self.__liststore_videos_remove(video)
+
+        if ignore and not row_hidden:
+            self.__liststore_videos_remove(self.__selected_videos)
 
         playlist_factory.save(self.__current_media._playlist)  # Important in case of a crash
         self.__on_treeselection_videos_changed()  # To reload the shortcuts
@@ -1544,10 +1748,13 @@ class PhantomPlayer:
             self.__mp_widget.stop()
 
         send2trash([video.get_path() for video in existent_videos])
+        for video in existent_videos:
+            file_availability.invalidate(video.get_path())
 
-        self.__current_media._playlist.remove_videos(self.__selected_videos)
-        for video in self.__selected_videos:
-            self.__liststore_videos_remove(video)
+        removed_indexes = self.__current_media._playlist.remove_videos(self.__selected_videos)
+        self.__liststore_videos_remove(self.__selected_videos)
+        if len(removed_indexes) > 0:
+            self.__liststore_videos_renumber(removed_indexes[0])
 
         playlist_factory.save(self.__current_media._playlist)  # Important in case of a crash
         self.__on_treeselection_videos_changed()  # To reload the shortcuts
@@ -1571,10 +1778,34 @@ class PhantomPlayer:
         # It's important to remove the sorting or the user & the liststore refresh will be messed up.
         self.__treeview_reset_sorting()
 
-        self.__current_media._playlist.move(videos=selected_videos, up=up)
+        changed_range = self.__current_media._playlist.move(videos=selected_videos, up=up)
+        self.__on_videos_moved(selected_videos, changed_range)
+
+    def __on_menuitem_videos_move_to(self, widget, top:bool):
+
+        if len(self.__selected_videos) == 0:
+            return
+
+        # in case that the selection changes during the whole process
+        selected_videos = copy(self.__selected_videos)
+
+        # It's important to remove the sorting or the user & the liststore refresh will be messed up.
+        self.__treeview_reset_sorting()
+
+        if top:
+            changed_range = self.__current_media._playlist.move_to_top(selected_videos)
+        else:
+            changed_range = self.__current_media._playlist.move_to_bottom(selected_videos)
+
+        self.__on_videos_moved(selected_videos, changed_range)
+
+    def __on_videos_moved(self, videos, changed_range):
+        if changed_range is None:
+            return
 
-        self.__liststore_videos_refresh()
-        self.__liststore_videos_select(selected_videos)
+        first, last = changed_range
+        self.__liststore_videos_refresh(first, last)
+        self.__liststore_videos_select(videos)
         playlist_factory.save(self.__current_media._playlist)
 
     def __on_menuitem_videos_open(self, *_):
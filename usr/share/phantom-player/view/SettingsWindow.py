@@ -45,6 +45,7 @@ from model.Playlist import LoadStatus as PlaylistLoadStatus
 from controller.playlist_factory import _COLUMN_SEPARATOR
 from controller import video_factory
 from controller import playlist_factory
+from controller import playlist_snapshot
 
 
 class PathsListstoreColumns:
@@ -61,20 +62,20 @@ class SettingsWindow:
     def __init__(self,
                  parent,
                  playlists,
+                 library,
                  add_playlist_func,
                  delete_playlist_func,
                  restart_playlist_func,
                  close_playlist_func,
                  change_playlist_func,
-                 add_video_glib_func,
-                 update_video_glib_func,
-                 remove_video_glib_func,
+                 remove_videos_glib_func,
                  reload_all_videos_func):
 
         self.__parent = parent
         self.__is_new_playlist = False
         self.__populating_settings = False
         self.__playlists = playlists
+        self.__library = library
         self.__current_playlist = None
         self.__icon_path = None
         self.__selected_playlist_path = None
@@ -92,9 +93,7 @@ class SettingsWindow:
 
         # These parent functions are to avoid reloading the liststore (and blinking)
         # when the settings are closed.
-        self.__parent_add_video_glib_func = add_video_glib_func
-        self.__parent_update_video_glib_func = update_video_glib_func
-        self.__parent_remove_video_glib_func = remove_video_glib_func
+        self.__parent_remove_videos_glib_func = remove_videos_glib_func
         self.__parent_reload_all_videos_func = reload_all_videos_func
 
         #
@@ -115,6 +114,7 @@ class SettingsWindow:
         self.__image_playlist = builder.get_object('image_playlist')
         self.__switch_keep_playing = builder.get_object('switch_keep_playing')
         self.__switch_random_playing = builder.get_object('switch_random_playing')
+        self.__comboboxtext_shuffle_mode = builder.get_object('comboboxtext_shuffle_mode')
         self.__switch_hidden = builder.get_object('switch_hidden')
         self.__spinbutton_audio = builder.get_object('spinbutton_audio')
         self.__spinbutton_subtitles = builder.get_object('spinbutton_subtitles')
@@ -163,6 +163,7 @@ class SettingsWindow:
         self.__switch_hidden.connect('button-press-event', self.__on_switch_hidden_press_event)
         self.__switch_keep_playing.connect('button-press-event', self.__on_switch_keep_playing_press_event)
         self.__switch_random_playing.connect('button-press-event', self.__on_switch_random_playing_press_event)
+        self.__comboboxtext_shuffle_mode.connect('changed', self.__on_comboboxtext_shuffle_mode_changed)
         self.__spinbutton_audio.connect('value-changed', self.__on_spinbutton_audio_value_changed)
         self.__spinbutton_subtitles.connect('value-changed', self.__on_spinbutton_subtitles_value_changed)
         self.__spinbutton_start_at_min.connect('value-changed', self.__on_spinbutton_start_at_value_changed)
@@ -243,6 +244,8 @@ class SettingsWindow:
             return
 
         else:
+            # The snapshot is named after the playlist file, and it would be stale after the save
+            playlist_snapshot.remove(self.__current_playlist.get_save_path())
             self.__current_playlist.set_name(new_name)
 
         playlist_factory.save(self.__current_playlist)  # Important in case of a crash
@@ -309,6 +312,9 @@ class SettingsWindow:
             self.__button_add.hide()
             self.__togglebutton_edit_name.show()
 
+            # The stats of the paths need the videos
+            playlist_factory.load_videos(self.__current_playlist)
+
             for playlist_path in self.__current_playlist.get_playlist_paths():
                 self.__liststore_paths_update_or_add(playlist_path)
 
@@ -334,6 +340,7 @@ class SettingsWindow:
         self.__spinbutton_subtitles.set_value(self.__current_playlist.get_subtitles_track())
         self.__spinbutton_start_at_min.set_value(self.__current_playlist.get_start_at() // 60)
         self.__spinbutton_start_at_sec.set_value(self.__current_playlist.get_start_at() % 60)
+        self.__comboboxtext_shuffle_mode.set_active_id(self.__current_playlist.get_shuffle_mode())
         self.__populating_settings = False
 
     def __liststore_paths_update_or_add(self, playlist_path, liststore_path=None):
@@ -367,26 +374,24 @@ class SettingsWindow:
         """
         self.__liststore_videos_path.append([path])
 
-    def __liststore_videos_path_add_glib(self, playlist, video):
-        GLib.idle_add(self.__liststore_videos_path_append, video.get_path())
-        self.__parent_add_video_glib_func(playlist, video)
-
-    def __liststore_videos_path_update_glib(self, playlist, video):
+    def __liststore_videos_path_add_glib(self, _playlist, video):
+        # The main window follows the model events of the playlist
         GLib.idle_add(self.__liststore_videos_path_append, video.get_path())
-        self.__parent_update_video_glib_func(playlist, video)
 
     def __thread_discover_paths(self, playlist_path, end_label, end_text):
         video_factory.discover(self.__current_playlist,
                                [playlist_path],
                                add_func=self.__liststore_videos_path_add_glib,
-                               update_func=self.__liststore_videos_path_update_glib)
+                               update_func=self.__liststore_videos_path_add_glib,
+                               library=self.__library)
         GLib.idle_add(end_label.set_text, end_text)
         GLib.idle_add(self.__liststore_paths_update_or_add, playlist_path)
         self.__unfreeze_all()
 
     def __thread_reload_paths(self):
         video_factory.discover(self.__current_playlist,
-                               update_func=self.__liststore_videos_path_add_glib)
+                               update_func=self.__liststore_videos_path_add_glib,
+                               library=self.__library)
         self.__unfreeze_all()
 
     def __unfreeze_all(self):
@@ -494,6 +499,13 @@ class SettingsWindow:
         status = not widget.get_active()
         self.__current_playlist.set_random(status)
 
+    def __on_comboboxtext_shuffle_mode_changed(self, comboboxtext):
+
+        if self.__populating_settings:
+            return
+
+        self.__current_playlist.set_shuffle_mode(comboboxtext.get_active_id())
+
     def __on_switch_keep_playing_press_event(self, widget, *_):
         status = not widget.get_active()
         self.__current_playlist.set_keep_playing(status)
@@ -581,7 +593,7 @@ class SettingsWindow:
             self.__dialog_paths.show()
             for video in removed_videos:
                 self.__liststore_videos_path.append([video.get_path()])
-                self.__parent_remove_video_glib_func(self.__current_playlist, video)
+            self.__parent_remove_videos_glib_func(self.__current_playlist, removed_videos)
 
         for row in self.__liststore_paths:
             if row[PathsListstoreColumns._path] == self.__selected_playlist_path.get_path():
@@ -640,7 +652,6 @@ class SettingsWindow:
         for video in self.__current_playlist.get_videos_by_playlist_path(self.__selected_playlist_path):
             new_path = video.get_path().replace(old_path, self.__edit_path_new_value, 1)
             video.set_path(new_path)
-            self.__parent_update_video_glib_func(self.__current_playlist, video)
 
         # Update the playlist dictionary
         new_playlist_path = self.__current_playlist.update_playlist_path(self.__selected_playlist_path,
@@ -701,7 +712,7 @@ class SettingsWindow:
                 self.__dialog_paths.show()
                 for video in removed_videos:
                     self.__liststore_videos_path.append([video.get_path()])
-                    self.__parent_remove_video_glib_func(self.__current_playlist, video)
+                self.__parent_remove_videos_glib_func(self.__current_playlist, removed_videos)
 
             playlist_path.set_recursive(new_state)  # Important to change the state AFTER getting the list of videos
 